@@ -3,25 +3,73 @@
 Component Enumeration Module for Auto APK Analyzer
 """
 
+import shutil
 import subprocess
 import time
 import json
 import os
 import re
+import socket
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from pathlib import Path
 
-# Load configuration
-config = {}
-try:
-    with open(os.path.join(os.path.dirname(__file__), '..', '..', 'config.json')) as f:
-        config = json.load(f)
-except FileNotFoundError:
-    print("Warning: config.json not found, using default paths")
+# Add src directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from config_cache import get_config
+
+# Load configuration through the shared cache
+config = get_config()
 
 # Get tool paths from config or use defaults
 DROZER_PATH = config.get('tools', {}).get('drozer', 'drozer')
 ADB_PATH = config.get('tools', {}).get('adb', 'adb')
 
+# Resolve the adb binary to an absolute path once, so each invocation
+# skips the per-exec PATH search
+ADB_PATH = shutil.which(ADB_PATH) or ADB_PATH
+
+# Component-name patterns compiled once at import time; drozer output is
+# matched as bytes so only captured names pay the decode cost. The
+# lookahead anchors the suffix at the end of the class name so e.g.
+# PushServiceReceiver never yields a truncated PushService match
+_COMPONENT_NAME_PATTERNS = {
+    suffix: re.compile(r'([a-zA-Z0-9_.]+' + suffix + r')(?![a-zA-Z0-9_])')
+    for suffix in ('Activity', 'Service', 'Receiver', 'ContentProvider')
+}
+_COMPONENT_NAME_PATTERNS_BYTES = {
+    suffix: re.compile(rb'([a-zA-Z0-9_.]+' + suffix.encode() + rb')(?![a-zA-Z0-9_])')
+    for suffix in ('Activity', 'Service', 'Receiver', 'ContentProvider')
+}
+
+def _ttl_cache(ttl):
+    """
+    Cache a zero-argument probe result for a short time-to-live.
+
+    Args:
+        ttl (float): Seconds to keep a cached result
+
+    Returns:
+        callable: Decorator wrapping the probe
+    """
+    def decorator(func):
+        cache = {}
+
+        def wrapper():
+            now = time.monotonic()
+            hit = cache.get('value')
+            if hit is not None and hit[1] > now:
+                return hit[0]
+            value = func()
+            cache['value'] = (value, now + ttl)
+            return value
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
 def is_drozer_available():
     """
     Check if Drozer is available and properly configured.
@@ -46,15 +94,51 @@ def is_device_connected():
     try:
         result = subprocess.run([ADB_PATH, 'devices'],
                               capture_output=True, text=True, check=True)
-        # Check if there are any devices listed (excluding the header)
-        lines = result.stdout.strip().split('\n')[1:]  # Skip "List of devices attached"
-        for line in lines:
-            if line.strip() and not line.startswith('*'):
+        # Short-circuit on the first device line (skip the header)
+        for line in result.stdout.splitlines()[1:]:
+            stripped = line.strip()
+            if stripped and not stripped.startswith('*'):
                 return True
         return False
     except subprocess.CalledProcessError:
         return False
 
+def _wait_until(pred, timeout=10, initial=0.05, factor=1.5):
+    """
+    Poll a readiness predicate with exponential backoff.
+
+    Args:
+        pred (callable): Returns True once the awaited condition holds
+        timeout (float): Maximum time to wait in seconds
+        initial (float): Initial delay between polls in seconds
+        factor (float): Backoff multiplier applied after each poll
+
+    Returns:
+        bool: True if the predicate succeeded within the timeout
+    """
+    deadline = time.monotonic() + timeout
+    delay = initial
+    while time.monotonic() < deadline:
+        if pred():
+            return True
+        time.sleep(delay)
+        delay *= factor
+    return False
+
+def _drozer_server_ready(port=31415):
+    """Check whether the Drozer server accepts connections on its port."""
+    try:
+        with socket.create_connection(('127.0.0.1', port), timeout=0.2):
+            return True
+    except OSError:
+        return False
+
+# Cached probe variants for batch paths; the public predicates stay
+# uncached so one-off callers always get a fresh probe. Late-bound
+# lambdas keep the cached variants following the module globals.
+_is_device_connected_cached = _ttl_cache(5.0)(lambda: is_device_connected())
+_is_drozer_available_cached = _ttl_cache(5.0)(lambda: is_drozer_available())
+
 def start_drozer_server():
     """
     Start the Drozer server.
@@ -69,8 +153,8 @@ def start_drozer_server():
             DROZER_PATH, 'server', 'start'
         ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
-        # Wait for server to start
-        time.sleep(3)
+        # Poll until the server accepts connections instead of a fixed sleep
+        _wait_until(lambda: server_process.poll() is not None or _drozer_server_ready())
 
         # Check if server is running
         if server_process.poll() is None:
@@ -102,42 +186,145 @@ def stop_drozer_server(server_process):
     except Exception as e:
         print(f"Error stopping Drozer server: {e}")
 
-def enumerate_activities(package_name):
+def _run_drozer_script(commands, timeout=120, stop_when=None):
     """
-    Enumerate exported activities for a package.
+    Run a batch of drozer commands through a single console session.
+
+    Each 'drozer console connect' pays JVM and agent handshake cost, so
+    batching all commands into one session avoids per-command spawns.
+    Output is streamed so parsing can overlap the console run and the
+    session can be cut short once the expected output has appeared.
 
     Args:
-        package_name (str): Package name to enumerate
+        commands (list): Drozer commands to execute
+        timeout (int): Timeout for the whole session in seconds
+        stop_when (callable): Optional predicate over the accumulated
+            bytes; when it returns True the console is terminated early
 
     Returns:
-        list: List of exported activities
+        bytes: Combined console stdout, or empty bytes on failure
     """
-    activities = []
+    import tempfile
+    import threading
 
+    script_path = None
+    proc = None
     try:
-        # Use Drozer to enumerate activities
-        cmd = [
-            DROZER_PATH, 'console', 'connect',
-            '-c', f'run app.activity.info -a {package_name}'
-        ]
-
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-
-        if result.returncode == 0:
-            # Parse the output to extract activities
-            lines = result.stdout.split('\n')
-            for line in lines:
-                if 'Activity' in line and package_name in line:
-                    # Extract activity name
-                    match = re.search(r'([a-zA-Z0-9_.]+Activity)', line)
-                    if match:
-                        activities.append(match.group(1))
-
-        return activities
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.rc', delete=False) as f:
+            f.write('\n'.join(commands) + '\n')
+            script_path = f.name
+
+        # Stream bytes; parsers match bytes patterns and decode only the
+        # component names they extract
+        cmd = [DROZER_PATH, 'console', 'connect', '--file', script_path]
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL)
+
+        timer = threading.Timer(timeout, proc.kill)
+        timer.start()
+        buffer = bytearray()
+        stopped_early = False
+        try:
+            for chunk in iter(lambda: proc.stdout.read(4096), b''):
+                buffer += chunk
+                if stop_when and stop_when(bytes(buffer)):
+                    stopped_early = True
+                    proc.terminate()
+                    break
+            proc.wait()
+        finally:
+            timer.cancel()
+
+        if proc.returncode == 0 or stopped_early:
+            return bytes(buffer)
+        return b''
+
+    except Exception as e:
+        print(f"Error running drozer script: {e}")
+        if proc and proc.poll() is None:
+            proc.kill()
+        return b''
+
+    finally:
+        if script_path and os.path.exists(script_path):
+            os.remove(script_path)
+
+def _parse_component_names(output, package_name, suffix):
+    """
+    Parse component names with a given class-name suffix from drozer output.
+
+    Args:
+        output (str): Drozer console output
+        package_name (str): Package name the components belong to
+        suffix (str): Component class-name suffix (e.g. 'Activity')
 
+    Returns:
+        list: List of matching component names
+    """
+    components = []
+
+    if isinstance(output, bytes):
+        pattern = _COMPONENT_NAME_PATTERNS_BYTES.get(suffix)
+        if pattern is None:
+            pattern = re.compile(rb'([a-zA-Z0-9_.]+' + suffix.encode() + rb')(?![a-zA-Z0-9_])')
+        package_needle = package_name.encode()
+        suffix_needle = suffix.encode()
+        for line in output.split(b'\n'):
+            if suffix_needle in line and package_needle in line:
+                match = pattern.search(line)
+                if match:
+                    # Decode only the captured component name
+                    components.append(match.group(1).decode('utf-8', 'replace'))
+        return components
+
+    pattern = _COMPONENT_NAME_PATTERNS.get(suffix)
+    if pattern is None:
+        pattern = re.compile(r'([a-zA-Z0-9_.]+' + suffix + r')(?![a-zA-Z0-9_])')
+    for line in output.split('\n'):
+        if suffix in line and package_name in line:
+            match = pattern.search(line)
+            if match:
+                components.append(match.group(1))
+    return components
+
+COMPONENT_SPEC = [
+    ('activities', 'app.activity.info', 'Activity'),
+    ('services', 'app.service.info', 'Service'),
+    ('receivers', 'app.broadcast.info', 'Receiver'),
+    ('providers', 'app.provider.info', 'ContentProvider'),
+]
+_COMPONENT_SPEC_BY_KEY = {key: (module, suffix) for key, module, suffix in COMPONENT_SPEC}
+
+def _enumerate_component_kind(package_name, key):
+    """
+    Enumerate one component kind for a package via the spec table.
+
+    Args:
+        package_name (str): Package name to enumerate
+        key (str): Component kind key from COMPONENT_SPEC
+
+    Returns:
+        list: List of matching component names
+    """
+    module, suffix = _COMPONENT_SPEC_BY_KEY[key]
+    try:
+        output = _run_drozer_script([f'run {module} -a {package_name}'])
+        return _parse_component_names(output, package_name, suffix)
     except Exception as e:
-        print(f"Error enumerating activities for {package_name}: {e}")
-        return activities
+        print(f"Error enumerating {key} for {package_name}: {e}")
+        return []
+
+def enumerate_activities(package_name):
+    """
+    Enumerate exported activities for a package.
+
+    Args:
+        package_name (str): Package name to enumerate
+
+    Returns:
+        list: List of exported activities
+    """
+    return _enumerate_component_kind(package_name, 'activities')
 
 def enumerate_services(package_name):
     """
@@ -149,32 +336,7 @@ def enumerate_services(package_name):
     Returns:
         list: List of exported services
     """
-    services = []
-
-    try:
-        # Use Drozer to enumerate services
-        cmd = [
-            DROZER_PATH, 'console', 'connect',
-            '-c', f'run app.service.info -a {package_name}'
-        ]
-
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-
-        if result.returncode == 0:
-            # Parse the output to extract services
-            lines = result.stdout.split('\n')
-            for line in lines:
-                if 'Service' in line and package_name in line:
-                    # Extract service name
-                    match = re.search(r'([a-zA-Z0-9_.]+Service)', line)
-                    if match:
-                        services.append(match.group(1))
-
-        return services
-
-    except Exception as e:
-        print(f"Error enumerating services for {package_name}: {e}")
-        return services
+    return _enumerate_component_kind(package_name, 'services')
 
 def enumerate_receivers(package_name):
     """
@@ -186,32 +348,7 @@ def enumerate_receivers(package_name):
     Returns:
         list: List of exported receivers
     """
-    receivers = []
-
-    try:
-        # Use Drozer to enumerate receivers
-        cmd = [
-            DROZER_PATH, 'console', 'connect',
-            '-c', f'run app.broadcast.info -a {package_name}'
-        ]
-
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-
-        if result.returncode == 0:
-            # Parse the output to extract receivers
-            lines = result.stdout.split('\n')
-            for line in lines:
-                if 'Receiver' in line and package_name in line:
-                    # Extract receiver name
-                    match = re.search(r'([a-zA-Z0-9_.]+Receiver)', line)
-                    if match:
-                        receivers.append(match.group(1))
-
-        return receivers
-
-    except Exception as e:
-        print(f"Error enumerating receivers for {package_name}: {e}")
-        return receivers
+    return _enumerate_component_kind(package_name, 'receivers')
 
 def enumerate_providers(package_name):
     """
@@ -223,32 +360,92 @@ def enumerate_providers(package_name):
     Returns:
         list: List of content providers
     """
-    providers = []
+    return _enumerate_component_kind(package_name, 'providers')
+
+def _carve_marked_segments(output, markers):
+    """
+    Split batched console output into per-command segments.
+
+    The console echoes every line it reads, so interleaved marker
+    "commands" come back as unambiguous segment boundaries. Markers
+    appear in script order; each segment runs from its marker's echo
+    to the next marker found.
+
+    Args:
+        output (str or bytes): Combined console output
+        markers (list): Marker strings (or bytes) in emission order
+
+    Returns:
+        list: One segment per marker, or None where a marker never
+            echoed in the output
+    """
+    starts = []
+    search_from = 0
+    for marker in markers:
+        start = output.find(marker, search_from) if output else -1
+        if start != -1:
+            search_from = start + len(marker)
+            start = search_from
+        starts.append(start)
+
+    segments = []
+    for index, start in enumerate(starts):
+        if start == -1:
+            segments.append(None)
+            continue
+        end = len(output)
+        for later in range(index + 1, len(starts)):
+            if starts[later] != -1:
+                end = starts[later] - len(markers[later])
+                break
+        segments.append(output[start:end])
+    return segments
+
+def probe_content_providers(provider_uris):
+    """
+    Probe content provider URIs for accessibility in one console session.
+
+    Args:
+        provider_uris (list): Content provider URIs to probe
+
+    Returns:
+        list: Probe results, one dict per URI
+    """
+    if not provider_uris:
+        return []
 
     try:
-        # Use Drozer to enumerate content providers
-        cmd = [
-            DROZER_PATH, 'console', 'connect',
-            '-c', f'run app.provider.info -a {package_name}'
-        ]
-
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-
-        if result.returncode == 0:
-            # Parse the output to extract providers
-            lines = result.stdout.split('\n')
-            for line in lines:
-                if 'Content Provider' in line and package_name in line:
-                    # Extract provider name
-                    match = re.search(r'([a-zA-Z0-9_.]+ContentProvider)', line)
-                    if match:
-                        providers.append(match.group(1))
-
-        return providers
+        # Interleave an explicit delimiter "command" before each query;
+        # searching for the URI itself misattributes output when one
+        # URI prefixes another (content://app.Provider vs
+        # content://app.Provider2)
+        markers = [f'==={index}:URI===' for index in range(len(provider_uris))]
+        script = []
+        for marker, uri in zip(markers, provider_uris):
+            script.append(marker)
+            script.append(f'run app.provider.query content://{uri}')
+        output = _run_drozer_script(script)
+        if isinstance(output, bytes):
+            output = output.decode('utf-8', 'replace')
+
+        results = []
+        for uri, segment in zip(provider_uris, _carve_marked_segments(output, markers)):
+            if segment is None:
+                results.append({'uri': uri, 'accessible': False, 'output': ''})
+                continue
+
+            accessible = 'Permission Denial' not in segment
+            results.append({
+                'uri': uri,
+                'accessible': accessible,
+                'output': segment if accessible else ''
+            })
+        return results
 
     except Exception as e:
-        print(f"Error enumerating providers for {package_name}: {e}")
-        return providers
+        print(f"Error probing content providers: {e}")
+        return [{'uri': uri, 'accessible': False, 'error': str(e)}
+                for uri in provider_uris]
 
 def probe_content_provider(provider_uri):
     """
@@ -260,68 +457,70 @@ def probe_content_provider(provider_uri):
     Returns:
         dict: Probe results
     """
-    try:
-        # Use Drozer to probe content provider
-        cmd = [
-            DROZER_PATH, 'console', 'connect',
-            '-c', f'run app.provider.query {provider_uri}'
-        ]
-
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-
-        return {
-            'uri': provider_uri,
-            'accessible': result.returncode == 0,
-            'output': result.stdout if result.returncode == 0 else result.stderr
-        }
-
-    except Exception as e:
-        print(f"Error probing content provider {provider_uri}: {e}")
-        return {
-            'uri': provider_uri,
-            'accessible': False,
-            'error': str(e)
-        }
+    results = probe_content_providers([provider_uri])
+    return results[0] if results else {'uri': provider_uri, 'accessible': False}
 
-def enumerate_components(package_name):
+def enumerate_components(package_name, manage_server=True):
     """
     Enumerate all exported components for a package.
 
     Args:
         package_name (str): Package name to enumerate
+        manage_server (bool): Start and stop a Drozer server for this call.
+            Pass False when the caller already runs a persistent server.
 
     Returns:
         dict: Dictionary containing all enumerated components
     """
-    if not is_device_connected():
-        print("Error: No Android device connected via ADB")
-        return {}
+    server_process = None
 
-    if not is_drozer_available():
-        print("Error: Drozer is not available")
-        return {}
+    if manage_server:
+        if not _is_device_connected_cached():
+            print("Error: No Android device connected via ADB")
+            return {}
 
-    # Start Drozer server
-    server_process = start_drozer_server()
-    if not server_process:
-        print("Error: Failed to start Drozer server")
-        return {}
+        if not _is_drozer_available_cached():
+            print("Error: Drozer is not available")
+            return {}
+
+        # Start Drozer server
+        server_process = start_drozer_server()
+        if not server_process:
+            print("Error: Failed to start Drozer server")
+            return {}
 
     try:
         print(f"Enumerating components for {package_name}...")
 
-        # Enumerate all component types
-        activities = enumerate_activities(package_name)
-        services = enumerate_services(package_name)
-        receivers = enumerate_receivers(package_name)
-        providers = enumerate_providers(package_name)
+        # Enumerate all component types in a single console session,
+        # delimited by echoed markers so each section is parsed with
+        # only its own suffix pattern. Grepping the combined blob would
+        # report a class like PushServiceReceiver under both the
+        # Service and the Receiver suffix
+        markers = [f'==={index}:{key}===' for index, (key, _, _) in enumerate(COMPONENT_SPEC)]
+        script = []
+        for marker, (_, module, _) in zip(markers, COMPONENT_SPEC):
+            script.append(marker)
+            script.append(f'run {module} -a {package_name}')
+        output = _run_drozer_script(script)
+        if isinstance(output, bytes):
+            markers = [marker.encode() for marker in markers]
+        segments = _carve_marked_segments(output, markers)
+
+        parsed = {
+            key: _parse_component_names(segment, package_name, suffix)
+            if segment is not None else []
+            for segment, (key, _, suffix) in zip(segments, COMPONENT_SPEC)
+        }
+        activities = parsed['activities']
+        services = parsed['services']
+        receivers = parsed['receivers']
+        providers = parsed['providers']
 
-        # Probe content providers for accessibility
-        provider_details = []
-        for provider in providers:
-            provider_uri = f"{package_name}.{provider}"
-            probe_result = probe_content_provider(provider_uri)
-            provider_details.append(probe_result)
+        # Probe content providers for accessibility in one batched session
+        provider_details = probe_content_providers(
+            [f"{package_name}.{provider}" for provider in providers]
+        )
 
         # Compile results
         results = {
@@ -341,39 +540,147 @@ def enumerate_components(package_name):
 
     finally:
         # Stop Drozer server
+        if manage_server:
+            stop_drozer_server(server_process)
+
+@contextmanager
+def _drozer_server():
+    """Context manager running a persistent Drozer server."""
+    server_process = start_drozer_server()
+    if not server_process:
+        raise RuntimeError("Failed to start Drozer server")
+    try:
+        yield server_process
+    finally:
         stop_drozer_server(server_process)
 
-def enumerate_all_packages():
+# Section headers in 'pm dump' output mapped to component kinds
+_PM_DUMP_SECTIONS = {
+    'Activity Resolver Table:': 'activities',
+    'Service Resolver Table:': 'services',
+    'Receiver Resolver Table:': 'receivers',
+    'Registered ContentProviders:': 'providers',
+}
+
+def fast_enumerate_components(package_name):
+    """
+    Enumerate components from 'pm dump' without spawning drozer.
+
+    A single adb call lists the package's resolver tables, which is much
+    cheaper than a drozer console session; use this to pre-filter
+    packages before any deep drozer probing.
+
+    Args:
+        package_name (str): Package name to enumerate
+
+    Returns:
+        dict: Dictionary containing all enumerated components
+    """
+    try:
+        result = subprocess.run([ADB_PATH, 'shell', 'pm', 'dump', package_name],
+                              capture_output=True, timeout=60)
+        output = result.stdout
+        if isinstance(output, bytes):
+            output = output.decode('utf-8', 'replace')
+
+        components = {kind: [] for kind in _PM_DUMP_SECTIONS.values()}
+        component_pattern = re.compile(re.escape(package_name) + r'/([\w.$]+)')
+
+        section = None
+        for line in output.splitlines():
+            stripped = line.strip()
+            if stripped in _PM_DUMP_SECTIONS:
+                section = _PM_DUMP_SECTIONS[stripped]
+                continue
+            if section:
+                match = component_pattern.search(line)
+                if match:
+                    name = match.group(1)
+                    if name not in components[section]:
+                        components[section].append(name)
+
+        return {
+            'package': package_name,
+            'activities': components['activities'],
+            'services': components['services'],
+            'receivers': components['receivers'],
+            'providers': components['providers'],
+            'timestamp': time.time()
+        }
+
+    except Exception as e:
+        print(f"Error enumerating components via pm dump for {package_name}: {e}")
+        return {}
+
+def _has_components(components):
+    """Check whether a fast enumeration found any components."""
+    return any(components.get(kind) for kind in _PM_DUMP_SECTIONS.values())
+
+def enumerate_all_packages(max_workers=8, deep=False):
     """
     Enumerate components for all installed packages.
 
+    Packages are fanned out across a thread pool, since each enumeration
+    is dominated by subprocess and ADB round-trip time rather than CPU.
+    By default components come from the cheap 'pm dump' path; with
+    deep=True, packages that exposed components are re-enumerated through
+    drozer (sharing one persistent server) for provider probing.
+
+    Args:
+        max_workers (int): Maximum number of concurrent enumerations
+        deep (bool): Re-enumerate exposed packages through drozer
+
     Returns:
         dict: Dictionary containing components for all packages
     """
-    if not is_device_connected():
+    if not _is_device_connected_cached():
         print("Error: No Android device connected via ADB")
         return {}
 
+    if deep and not _is_drozer_available_cached():
+        print("Error: Drozer is not available")
+        return {}
+
     try:
         # Get list of installed packages
         result = subprocess.run([ADB_PATH, 'shell', 'pm', 'list', 'packages', '-3'],
                               capture_output=True, text=True, check=True)
 
-        packages = []
-        for line in result.stdout.strip().split('\n'):
-            if line.startswith('package:'):
-                package_name = line.split(':')[1]
-                packages.append(package_name)
-
-        print(f"Found {len(packages)} third-party packages")
+        # Stream package names straight into the executor without
+        # materializing an intermediate list
+        packages = (line[len('package:'):] for line in result.stdout.splitlines()
+                    if line.startswith('package:'))
 
-        # Enumerate components for each package
+        # Pre-filter every package with the fast pm dump path
         all_components = {}
-        for package in packages:
-            print(f"Enumerating components for {package}...")
-            components = enumerate_components(package)
-            if components:
-                all_components[package] = components
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(fast_enumerate_components, package): package
+                for package in packages
+            }
+            print(f"Found {len(futures)} third-party packages")
+            for future in as_completed(futures):
+                package = futures[future]
+                components = future.result()
+                if components and _has_components(components):
+                    all_components[package] = components
+
+        if not deep:
+            return all_components
+
+        # Deep pass: drozer enumeration only for packages that exposed
+        # components, against one shared server
+        with _drozer_server():
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(enumerate_components, package, False): package
+                    for package in all_components
+                }
+                for future in as_completed(futures):
+                    package = futures[future]
+                    components = future.result()
+                    if components:
+                        all_components[package] = components
 
         return all_components
 
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Shared Configuration Cache for Auto APK Analyzer
+"""
+
+import json
+import os
+import threading
+
+# Default location of config.json (repository root)
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(__file__), '..', 'config.json')
+
+# Module-level cache shared by all importers, guarded by a lock so
+# subprocess workers and threads share a single parsed copy
+_CACHE = {'path': None, 'mtime': None, 'data': {}}
+_CACHE_LOCK = threading.Lock()
+
+def get_config(path=None):
+    """
+    Load and cache the configuration file.
+
+    The parsed dict is memoized and only re-read when the file's
+    modification time changes, so repeated imports and calls share
+    one read instead of re-parsing config.json per module.
+
+    Args:
+        path (str): Path to the config file (defaults to repo config.json)
+
+    Returns:
+        dict: Parsed configuration, or empty dict if not found
+    """
+    config_path = path or DEFAULT_CONFIG_PATH
+
+    with _CACHE_LOCK:
+        try:
+            mtime = os.stat(config_path).st_mtime_ns
+        except FileNotFoundError:
+            if _CACHE['path'] != config_path:
+                print("Warning: config.json not found, using default paths")
+                _CACHE.update(path=config_path, mtime=None, data={})
+            return _CACHE['data']
+
+        if _CACHE['path'] == config_path and _CACHE['mtime'] == mtime:
+            return _CACHE['data']
+
+        with open(config_path) as f:
+            data = json.load(f)
+
+        _CACHE.update(path=config_path, mtime=mtime, data=data)
+        return data
+
+# Default location of api_keys.json (repository root)
+DEFAULT_API_KEYS_PATH = os.path.join(os.path.dirname(__file__), '..', 'api_keys.json')
+
+_API_KEYS_CACHE = {'path': None, 'mtime': None, 'data': {}}
+
+def get_api_keys(path=None):
+    """
+    Load and cache the API keys file.
+
+    Same memoization scheme as get_config: one parse per process,
+    refreshed only when the file's modification time changes.
+
+    Args:
+        path (str): Path to the keys file (defaults to repo api_keys.json)
+
+    Returns:
+        dict: Parsed API keys, or empty dict if not found
+    """
+    keys_path = path or DEFAULT_API_KEYS_PATH
+
+    with _CACHE_LOCK:
+        try:
+            mtime = os.stat(keys_path).st_mtime_ns
+        except FileNotFoundError:
+            if _API_KEYS_CACHE['path'] != keys_path:
+                print("Warning: api_keys.json not found")
+                _API_KEYS_CACHE.update(path=keys_path, mtime=None, data={})
+            return _API_KEYS_CACHE['data']
+
+        if _API_KEYS_CACHE['path'] == keys_path and _API_KEYS_CACHE['mtime'] == mtime:
+            return _API_KEYS_CACHE['data']
+
+        with open(keys_path) as f:
+            data = json.load(f)
+
+        _API_KEYS_CACHE.update(path=keys_path, mtime=mtime, data=data)
+        return data
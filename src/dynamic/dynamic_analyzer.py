@@ -3,25 +3,254 @@
 Dynamic Analysis Module for Auto APK Analyzer
 """
 
+import shutil
 import subprocess
 import time
 import json
 import os
-import requests
+import sys
 from pathlib import Path
 
-# Load configuration
-config = {}
-try:
-    with open(os.path.join(os.path.dirname(__file__), '..', '..', 'config.json')) as f:
-        config = json.load(f)
-except FileNotFoundError:
-    print("Warning: config.json not found, using default paths")
+# Add src directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from config_cache import get_config
+
+# Load configuration through the shared cache
+config = get_config()
 
 # Get tool paths from config or use defaults
 FRIDA_PATH = config.get('tools', {}).get('frida', 'frida')
 ADB_PATH = config.get('tools', {}).get('adb', 'adb')
 
+# Resolve the adb binary to an absolute path once, so each invocation
+# skips the per-exec PATH search
+ADB_PATH = shutil.which(ADB_PATH) or ADB_PATH
+
+# Basic certificate pinning bypass script
+CERT_BYPASS_JS = """
+Java.perform(function() {
+    var CertificateFactory = Java.use("java.security.cert.CertificateFactory");
+    var TrustManagerFactory = Java.use("javax.net.ssl.TrustManagerFactory");
+    var SSLContext = Java.use("javax.net.ssl.SSLContext");
+
+    // TrustManager implementation
+    var TrustManager = Java.registerClass({
+        name: 'com.example.TrustManager',
+        implements: [Java.use('javax.net.ssl.X509TrustManager')],
+        methods: {
+            checkClientTrusted: function(chain, authType) {},
+            checkServerTrusted: function(chain, authType) {},
+            getAcceptedIssuers: function() { return []; }
+        }
+    });
+
+    // Override SSLContext.init
+    SSLContext.init.overload('[Ljavax.net.ssl.KeyManager;', '[Ljavax.net.ssl.TrustManager;', 'java.security.SecureRandom').implementation = function(keyManager, trustManager, secureRandom) {
+        console.log('[*] SSLContext.init called');
+        var trustManagers = [TrustManager.$new()];
+        this.init(keyManager, trustManagers, secureRandom);
+    };
+
+    console.log('[*] Certificate pinning bypass loaded');
+});
+"""
+
+# Frida script to disable Flutter TLS verification
+# Based on NVISO's disable-flutter-tls-verification
+FLUTTER_TLS_JS = """
+console.log("[*] Loading Flutter TLS bypass script");
+
+// Wait for the Dart VM to be initialized
+setTimeout(function() {
+    // Try to find and hook the Dart VM functions
+    try {
+        // Hook for Dart SDK < 3.0
+        var tls_validation_enabled = Module.findExportByName(null, "dart::bin::Builtin::TLSCertificateCallback");
+        if (tls_validation_enabled) {
+            Interceptor.replace(tls_validation_enabled, new NativeCallback(function() {
+                console.log("[*] Bypassing Flutter TLS validation (Dart SDK < 3.0)");
+                return 0; // Return false to bypass validation
+            }, 'int', []));
+        }
+
+        // Hook for Dart SDK >= 3.0
+        var tls_validation_new = Module.findExportByName(null, "_kDartBuiltinTLSCertificateCallback");
+        if (tls_validation_new) {
+            Interceptor.replace(tls_validation_new, new NativeCallback(function() {
+                console.log("[*] Bypassing Flutter TLS validation (Dart SDK >= 3.0)");
+                return 0; // Return false to bypass validation
+            }, 'int', []));
+        }
+
+        console.log("[*] Flutter TLS bypass hooks installed");
+    } catch (e) {
+        console.log("[!] Error installing Flutter TLS bypass: " + e);
+    }
+}, 1000);
+"""
+
+def _materialize_script(name, content):
+    """
+    Write a Frida script to an on-disk cache and return its path.
+
+    The path is keyed by a hash of the content, so each unique script is
+    written once per lifetime instead of leaking a tempfile per call.
+
+    Args:
+        name (str): Short script name used in the cached filename
+        content (str): Script source
+
+    Returns:
+        str: Path to the cached script
+    """
+    import hashlib
+
+    digest = hashlib.sha1(content.encode('utf-8')).hexdigest()[:8]
+    cache_dir = Path(__file__).parent / '_cache'
+    script_path = cache_dir / f'{name}_{digest}.js'
+
+    if not script_path.exists():
+        cache_dir.mkdir(exist_ok=True)
+        # Write atomically so concurrent hooks never see a partial script
+        tmp_path = script_path.with_suffix('.js.tmp')
+        tmp_path.write_text(content)
+        tmp_path.replace(script_path)
+
+    return str(script_path)
+
+# Cached USB device handle shared by all bindings-based hooks
+_frida_device = None
+
+class _FridaScriptHandle:
+    """
+    Handle for a script injected through the frida Python bindings.
+
+    Mirrors the small part of the subprocess.Popen surface callers use
+    (poll/terminate) so it can stand in for the CLI process object.
+    """
+
+    def __init__(self, session, script):
+        self.session = session
+        self.script = script
+        self._detached = False
+
+    def poll(self):
+        """Return None while the session is attached (Popen-compatible)."""
+        return None if not self._detached else 0
+
+    def terminate(self):
+        """Unload the script and detach from the target process."""
+        if self._detached:
+            return
+        try:
+            self.script.unload()
+        except Exception:
+            pass
+        try:
+            self.session.detach()
+        except Exception:
+            pass
+        self._detached = True
+
+def _attach_with_bindings(package_name, script_source):
+    """
+    Inject a script via the frida Python bindings, reusing one device.
+
+    Avoids spawning the frida CLI (a fresh interpreter plus USB session
+    handshake) per hook.
+
+    Args:
+        package_name (str): Package name to attach to
+        script_source (str): Frida script source to load
+
+    Returns:
+        _FridaScriptHandle: Handle if successful, None if the bindings
+            are unavailable or attaching failed
+    """
+    global _frida_device
+
+    try:
+        import frida
+    except ImportError:
+        return None
+
+    try:
+        if _frida_device is None:
+            _frida_device = frida.get_usb_device(timeout=5)
+
+        session = _frida_device.attach(package_name)
+        script = session.create_script(script_source)
+        script.load()
+        return _FridaScriptHandle(session, script)
+
+    except Exception as e:
+        print(f"Frida bindings attach failed for {package_name}: {e}")
+        return None
+
+def _wait_for_exit(process, timeout=2.0, initial=0.05, factor=1.5):
+    """
+    Poll a process with exponential backoff until it exits or times out.
+
+    Args:
+        process (subprocess.Popen): Process to watch
+        timeout (float): Maximum time to wait in seconds
+        initial (float): Initial delay between polls in seconds
+        factor (float): Backoff multiplier applied after each poll
+
+    Returns:
+        bool: True if the process exited within the timeout
+    """
+    deadline = time.monotonic() + timeout
+    delay = initial
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            return True
+        time.sleep(delay)
+        delay *= factor
+    return process.poll() is not None
+
+def _adb_shell_many(commands, check=True):
+    """
+    Run several device shell commands through a single adb invocation.
+
+    Each discrete 'adb shell' call pays client-daemon round-trip and
+    process spawn cost, so batch commands with ';' where ordering allows.
+
+    Args:
+        commands (list): Shell commands to run on the device
+        check (bool): Raise on non-zero exit status
+
+    Returns:
+        subprocess.CompletedProcess: Result of the combined invocation
+    """
+    return subprocess.run([ADB_PATH, 'shell', '; '.join(commands)],
+                        capture_output=True, check=check)
+
+def _wait_for_app_start(package_name, timeout=10, initial=0.1, factor=1.5):
+    """
+    Poll until an app process is running on the device.
+
+    Args:
+        package_name (str): Package name to wait for
+        timeout (float): Maximum time to wait in seconds
+        initial (float): Initial delay between polls in seconds
+        factor (float): Backoff multiplier applied after each poll
+
+    Returns:
+        bool: True if the app started within the timeout
+    """
+    deadline = time.monotonic() + timeout
+    delay = initial
+    while time.monotonic() < deadline:
+        result = subprocess.run([ADB_PATH, 'shell', 'pidof', package_name],
+                              capture_output=True, text=True)
+        if result.stdout.strip():
+            return True
+        time.sleep(delay)
+        delay *= factor
+    return False
+
 def setup_reqable_capture(package_name):
     """
     Setup Reqable proxy for traffic capture.
@@ -70,41 +299,13 @@ def run_frida_hook(package_name, script_path=None):
     print(f"Running Frida hook on {package_name}")
 
     try:
-        # If no script provided, use a basic certificate pinning bypass script
+        # Prefer the in-process frida bindings over spawning the CLI
         if not script_path:
-            # Create a temporary script for basic certificate pinning bypass
-            script_content = """
-Java.perform(function() {
-    var CertificateFactory = Java.use("java.security.cert.CertificateFactory");
-    var TrustManagerFactory = Java.use("javax.net.ssl.TrustManagerFactory");
-    var SSLContext = Java.use("javax.net.ssl.SSLContext");
-
-    // TrustManager implementation
-    var TrustManager = Java.registerClass({
-        name: 'com.example.TrustManager',
-        implements: [Java.use('javax.net.ssl.X509TrustManager')],
-        methods: {
-            checkClientTrusted: function(chain, authType) {},
-            checkServerTrusted: function(chain, authType) {},
-            getAcceptedIssuers: function() { return []; }
-        }
-    });
-
-    // Override SSLContext.init
-    SSLContext.init.overload('[Ljavax.net.ssl.KeyManager;', '[Ljavax.net.ssl.TrustManager;', 'java.security.SecureRandom').implementation = function(keyManager, trustManager, secureRandom) {
-        console.log('[*] SSLContext.init called');
-        var trustManagers = [TrustManager.$new()];
-        this.init(keyManager, trustManagers, secureRandom);
-    };
-
-    console.log('[*] Certificate pinning bypass loaded');
-});
-"""
-            # Write script to temporary file
-            import tempfile
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.js', delete=False) as f:
-                f.write(script_content)
-                script_path = f.name
+            handle = _attach_with_bindings(package_name, CERT_BYPASS_JS)
+            if handle:
+                print("Frida hook started successfully (bindings)")
+                return handle
+            script_path = _materialize_script('cert_bypass', CERT_BYPASS_JS)
 
         print(f"Using script: {script_path}")
 
@@ -126,11 +327,8 @@ Java.perform(function() {
             text=True
         )
 
-        # Wait a moment to see if it starts successfully
-        time.sleep(2)
-
-        # Check if process is still running
-        if frida_process.poll() is None:
+        # Poll briefly for early exit instead of a fixed sleep
+        if not _wait_for_exit(frida_process):
             print("Frida hook started successfully")
             return frida_process
         else:
@@ -155,48 +353,14 @@ def run_frida_flutter_hook(package_name):
     print(f"Running Frida Flutter hook on {package_name}")
 
     try:
-        # Create a script for Flutter TLS verification bypass
-        # This is based on NVISO's disable-flutter-tls-verification script
-        flutter_script_content = """
-// Frida script to disable Flutter TLS verification
-// Based on NVISO's disable-flutter-tls-verification
-
-console.log("[*] Loading Flutter TLS bypass script");
-
-// Wait for the Dart VM to be initialized
-setTimeout(function() {
-    // Try to find and hook the Dart VM functions
-    try {
-        // Hook for Dart SDK < 3.0
-        var tls_validation_enabled = Module.findExportByName(null, "dart::bin::Builtin::TLSCertificateCallback");
-        if (tls_validation_enabled) {
-            Interceptor.replace(tls_validation_enabled, new NativeCallback(function() {
-                console.log("[*] Bypassing Flutter TLS validation (Dart SDK < 3.0)");
-                return 0; // Return false to bypass validation
-            }, 'int', []));
-        }
-
-        // Hook for Dart SDK >= 3.0
-        var tls_validation_new = Module.findExportByName(null, "_kDartBuiltinTLSCertificateCallback");
-        if (tls_validation_new) {
-            Interceptor.replace(tls_validation_new, new NativeCallback(function() {
-                console.log("[*] Bypassing Flutter TLS validation (Dart SDK >= 3.0)");
-                return 0; // Return false to bypass validation
-            }, 'int', []));
-        }
+        # Prefer the in-process frida bindings over spawning the CLI
+        handle = _attach_with_bindings(package_name, FLUTTER_TLS_JS)
+        if handle:
+            print("Frida Flutter hook started successfully (bindings)")
+            return handle
 
-        console.log("[*] Flutter TLS bypass hooks installed");
-    } catch (e) {
-        console.log("[!] Error installing Flutter TLS bypass: " + e);
-    }
-}, 1000);
-"""
-
-        # Write script to temporary file
-        import tempfile
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.js', delete=False) as f:
-            f.write(flutter_script_content)
-            script_path = f.name
+        # Use the cached Flutter TLS verification bypass script
+        script_path = _materialize_script('flutter_tls', FLUTTER_TLS_JS)
 
         # Run Frida with the Flutter script
         frida_cmd = [
@@ -216,11 +380,8 @@ setTimeout(function() {
             text=True
         )
 
-        # Wait a moment to see if it starts successfully
-        time.sleep(2)
-
-        # Check if process is still running
-        if frida_process.poll() is None:
+        # Poll briefly for early exit instead of a fixed sleep
+        if not _wait_for_exit(frida_process):
             print("Frida Flutter hook started successfully")
             return frida_process
         else:
@@ -242,9 +403,10 @@ def collect_proxy_flows(duration=300):
     Returns:
         list: List of captured flows
     """
-    # This is a placeholder implementation
+    # This is a placeholder implementation; the simulated collection
+    # time respects short durations so duration=0 returns immediately
     print(f"Collecting proxy flows for {duration} seconds...")
-    time.sleep(2)  # Simulate collection time
+    time.sleep(min(duration, 2))
 
     # Placeholder results
     flows = [
@@ -297,10 +459,10 @@ def is_device_connected():
     try:
         result = subprocess.run([ADB_PATH, 'devices'],
                               capture_output=True, text=True, check=True)
-        # Check if there are any devices listed (excluding the header)
-        lines = result.stdout.strip().split('\n')[1:]  # Skip "List of devices attached"
-        for line in lines:
-            if line.strip() and not line.startswith('*'):
+        # Short-circuit on the first device line (skip the header)
+        for line in result.stdout.splitlines()[1:]:
+            stripped = line.strip()
+            if stripped and not stripped.startswith('*'):
                 return True
         return False
     except subprocess.CalledProcessError:
@@ -323,17 +485,15 @@ def spawn_and_hook_app(package_name, script_path=None, is_flutter=False):
         return None
 
     try:
-        # Force stop the app first
-        subprocess.run([ADB_PATH, 'shell', 'am', 'force-stop', package_name],
-                      capture_output=True, check=True)
-
-        # Spawn the app
+        # Force stop and relaunch the app in one adb round-trip
         print(f"Spawning app: {package_name}")
-        subprocess.run([ADB_PATH, 'shell', 'monkey', '-p', package_name, '-c', 'android.intent.category.LAUNCHER', '1'],
-                      capture_output=True, check=True)
+        _adb_shell_many([
+            f'am force-stop {package_name}',
+            f'monkey -p {package_name} -c android.intent.category.LAUNCHER 1'
+        ])
 
         # Wait for app to start
-        time.sleep(3)
+        _wait_for_app_start(package_name)
 
         # Run appropriate Frida hook
         if is_flutter:
@@ -3,72 +3,240 @@
 Flutter Application Handler for Auto APK Analyzer
 """
 
+import functools
+import shutil
 import subprocess
 import time
 import json
+import mmap
 import os
+import re
+import struct
+import sys
 import zipfile
 from pathlib import Path
 
-# Load configuration
-config = {}
-try:
-    with open(os.path.join(os.path.dirname(__file__), '..', '..', 'config.json')) as f:
-        config = json.load(f)
-except FileNotFoundError:
-    print("Warning: config.json not found, using default paths")
+# Add src directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from config_cache import get_config
+
+# Load configuration through the shared cache
+config = get_config()
 
 # Get tool paths from config or use defaults
 ADB_PATH = config.get('tools', {}).get('adb', 'adb')
 
-def is_flutter_app(apk_path):
+# Resolve the adb binary to an absolute path once, so each invocation
+# skips the per-exec PATH search
+ADB_PATH = shutil.which(ADB_PATH) or ADB_PATH
+
+# Flutter class indicators, pre-encoded once so the content scan works on
+# raw bytes without a per-entry UTF-8 decode pass
+_FLUTTER_INDICATORS_BYTES = (
+    b'io.flutter',
+    b'FlutterActivity',
+    b'FlutterFragment',
+    b'FlutterApplication'
+)
+
+# Single automaton over all indicators so each buffer is scanned once in
+# C instead of once per indicator; the shared 'Flutter' prefix is
+# factored out so the engine only branches after the literal prefix
+_FLUTTER_INDICATOR_RE = re.compile(rb'io\.flutter|Flutter(?:Activity|Fragment|Application)')
+
+# Overlap carried between read chunks so an indicator split across a
+# chunk boundary is still found (longest indicator minus one byte)
+_SCAN_OVERLAP = max(len(ind) for ind in _FLUTTER_INDICATORS_BYTES) - 1
+_SCAN_CHUNK_SIZE = 65536
+
+def _scan_stored_entry(mm, zi):
+    """
+    Search an uncompressed (STORED) entry directly in the mapped APK.
+
+    Args:
+        mm (mmap.mmap): Read-only mapping of the whole APK file
+        zi (zipfile.ZipInfo): STORED entry to scan
+
+    Returns:
+        bool: True if any indicator was found in the entry
+    """
+    # Local file header is 30 bytes; filename/extra lengths sit at
+    # offsets 26/28 and must be read from the header itself, as they can
+    # differ from the central-directory copy
+    name_len, extra_len = struct.unpack_from('<HH', mm, zi.header_offset + 26)
+    data_off = zi.header_offset + 30 + name_len + extra_len
+    return _FLUTTER_INDICATOR_RE.search(mm, data_off, data_off + zi.file_size) is not None
+
+def _entry_contains_indicator(apk, entry, buf=None):
+    """
+    Scan a ZIP entry for Flutter indicators in fixed-size byte chunks.
+
+    Reads via readinto() so the caller-provided buffer is refilled in
+    place across chunks and entries instead of allocating a fresh bytes
+    object per read. The first _SCAN_OVERLAP bytes of the buffer hold
+    the tail of the previous chunk so matches spanning a boundary are
+    still found.
+
+    Args:
+        apk (zipfile.ZipFile): Open APK archive
+        entry (zipfile.ZipInfo): Entry to scan
+        buf (bytearray): Reusable scan buffer; allocated if None
+
+    Returns:
+        bool: True if any indicator was found in the entry
+    """
+    if buf is None:
+        buf = bytearray(_SCAN_OVERLAP + _SCAN_CHUNK_SIZE)
+    mv = memoryview(buf)
+    with apk.open(entry) as fh:
+        tail_len = 0
+        while True:
+            n = fh.readinto(mv[_SCAN_OVERLAP:])
+            if not n:
+                return False
+            if _FLUTTER_INDICATOR_RE.search(mv[_SCAN_OVERLAP - tail_len:_SCAN_OVERLAP + n]):
+                return True
+            # Copy the chunk tail into the overlap region for the next round
+            tail_len = min(_SCAN_OVERLAP, n)
+            mv[_SCAN_OVERLAP - tail_len:_SCAN_OVERLAP] = \
+                mv[_SCAN_OVERLAP + n - tail_len:_SCAN_OVERLAP + n]
+
+def is_flutter_app_from_zip(apk, deep=False):
+    """
+    Detect a Flutter application from an already-open APK archive.
+
+    Callers that keep the APK open for several inspections can pass the
+    handle here and pay the central-directory parse only once instead of
+    re-opening the ZIP per probe.
+
+    Args:
+        apk (zipfile.ZipFile): Open APK archive
+        deep (bool): Also scan DEX entries for Flutter classes (slower)
+
+    Returns:
+        bool: True if the app appears to be a Flutter application, False otherwise
+    """
+    try:
+        # Single pass over the central directory: filename checks
+        # (no decompression) answer immediately, while scannable
+        # entries are collected for the content fallback. Directory
+        # entries, zero-byte stubs and duplicate names are skipped
+        # so each candidate is opened at most once.
+        seen = set()
+        candidates = []
+        for zi in apk.infolist():
+            name = zi.filename
+            if name.startswith('assets/flutter_assets'):
+                return True
+            if name.endswith('libflutter.so'):
+                return True
+            if zi.is_dir() or zi.file_size == 0 or name in seen:
+                continue
+            seen.add(name)
+            if name == 'AndroidManifest.xml' or (deep and name.endswith('.dex')):
+                candidates.append(zi)
+
+        # Fall back to content scanning only when the cheap checks miss.
+        # The manifest is a single small entry; DEX files can be tens of
+        # megabytes, so they are only scanned on request. STORED
+        # entries are searched in place through a demand-paged mapping
+        # of the APK, skipping the decompress-and-copy step entirely.
+        mm = None
+        apk_file = None
+        scan_buf = bytearray(_SCAN_OVERLAP + _SCAN_CHUNK_SIZE) if candidates else None
+        try:
+            for zi in candidates:
+                try:
+                    if zi.compress_type == zipfile.ZIP_STORED and apk.filename:
+                        if mm is None:
+                            apk_file = open(apk.filename, 'rb')
+                            mm = mmap.mmap(apk_file.fileno(), 0, access=mmap.ACCESS_READ)
+                        if _scan_stored_entry(mm, zi):
+                            return True
+                    elif _entry_contains_indicator(apk, zi, scan_buf):
+                        return True
+                except:
+                    continue
+        finally:
+            if mm is not None:
+                mm.close()
+            if apk_file is not None:
+                apk_file.close()
+
+        return False
+
+    except Exception as e:
+        print(f"Error detecting Flutter app: {e}")
+        return False
+
+def is_flutter_app(apk_path, deep=False):
     """
     Detect if an APK is a Flutter application.
 
     Args:
         apk_path (str): Path to the APK file
+        deep (bool): Also scan DEX entries for Flutter classes (slower)
 
     Returns:
         bool: True if the app appears to be a Flutter application, False otherwise
     """
     try:
-        # Check if the APK contains flutter_assets directory or libflutter.so
-        with zipfile.ZipFile(apk_path, 'r') as apk:
-            # List all files in the APK
-            files = apk.namelist()
-
-            # Check for Flutter indicators
-            has_flutter_assets = any('assets/flutter_assets' in f for f in files)
-            has_libflutter = any('libflutter.so' in f for f in files)
-            has_flutter_activity = False
-
-            # Check for Flutter-related classes in the manifest or code
-            # This is a simplified check - in a real implementation, we would parse the manifest
-            flutter_indicators = [
-                'io.flutter',
-                'FlutterActivity',
-                'FlutterFragment',
-                'FlutterApplication'
-            ]
-
-            # Check if any file contains Flutter indicators
-            for f in files:
-                if f.endswith(('.xml', '.dex')):
-                    try:
-                        with apk.open(f) as file_content:
-                            content = file_content.read().decode('utf-8', errors='ignore')
-                            if any(indicator in content for indicator in flutter_indicators):
-                                has_flutter_activity = True
-                                break
-                    except:
-                        continue
-
-            return has_flutter_assets or has_libflutter or has_flutter_activity
-
+        # Check if the APK contains flutter_assets directory or libflutter.so.
+        # strict_timestamps=False skips the per-entry datetime clamping
+        # during the central-directory parse, which adds up on APKs with
+        # thousands of entries
+        with zipfile.ZipFile(apk_path, 'r', strict_timestamps=False) as apk:
+            return is_flutter_app_from_zip(apk, deep=deep)
     except Exception as e:
         print(f"Error detecting Flutter app: {e}")
         return False
 
+@functools.lru_cache(maxsize=256)
+def _is_flutter_app_memo(apk_path, mtime_ns, size):
+    """Memoized backend for is_flutter_app_cached, keyed on file identity."""
+    # A sidecar file next to the APK carries the result across runs, so
+    # re-scans of an unchanged workspace skip the ZIP open entirely
+    sidecar = apk_path + '.flutter.cache.json'
+    try:
+        with open(sidecar) as f:
+            cached = json.load(f)
+        if cached.get('mtime_ns') == mtime_ns and cached.get('size') == size:
+            return bool(cached.get('is_flutter'))
+    except (OSError, ValueError):
+        pass
+
+    result = is_flutter_app(apk_path)
+
+    try:
+        with open(sidecar, 'w') as f:
+            f.write(json.dumps({'is_flutter': result, 'mtime_ns': mtime_ns, 'size': size}))
+    except OSError:
+        pass
+
+    return result
+
+def is_flutter_app_cached(apk_path):
+    """
+    Detect a Flutter APK, reusing a cached result for unchanged files.
+
+    The result is memoized on (path, mtime, size) so repeated probes of
+    the same APK - e.g. detection in analyze_apk followed by
+    handle_flutter_app - only pay the ZIP scan once.
+
+    Args:
+        apk_path (str): Path to the APK file
+
+    Returns:
+        bool: True if the app appears to be a Flutter application, False otherwise
+    """
+    try:
+        st = os.stat(apk_path)
+    except OSError as e:
+        print(f"Error detecting Flutter app: {e}")
+        return False
+    return _is_flutter_app_memo(apk_path, st.st_mtime_ns, st.st_size)
+
 def setup_flutter_interception(package_name):
     """
     Setup interception for Flutter applications.
@@ -146,16 +314,17 @@ def setup_proxy_routing(device_ip, proxy_port=8080):
         print(f"Setting up proxy routing to {device_ip}:{proxy_port}")
 
         # Configure Wi-Fi proxy settings on the device
-        # This is a simplified example - in practice, this would be more complex
-        proxy_setup_commands = [
-            ['adb', 'shell', 'settings', 'put', 'global', 'http_proxy', f'{device_ip}:{proxy_port}'],
-            ['adb', 'shell', 'settings', 'put', 'global', 'https_proxy', f'{device_ip}:{proxy_port}']
-        ]
-
-        for cmd in proxy_setup_commands:
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode != 0:
-                print(f"Warning: Failed to execute command {' '.join(cmd)}")
+        # Both writes go through one adb shell invocation - each adb
+        # roundtrip costs a process spawn plus a device handshake
+        cmd = [ADB_PATH, 'shell',
+               f'settings put global http_proxy {device_ip}:{proxy_port}; '
+               f'settings put global https_proxy {device_ip}:{proxy_port}']
+        # stdout is never examined, so discard it; keep stderr only for
+        # the failure diagnostic
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        if result.returncode != 0:
+            print(f"Warning: Failed to execute command {' '.join(cmd)}: "
+                  f"{result.stderr.decode('utf-8', 'replace').strip()}")
 
         print("Proxy routing configured")
         return True
@@ -174,16 +343,14 @@ def disable_proxy_routing():
     try:
         print("Disabling proxy routing")
 
-        # Disable proxy settings
-        proxy_disable_commands = [
-            ['adb', 'shell', 'settings', 'put', 'global', 'http_proxy', ':0'],
-            ['adb', 'shell', 'settings', 'put', 'global', 'https_proxy', ':0']
-        ]
-
-        for cmd in proxy_disable_commands:
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode != 0:
-                print(f"Warning: Failed to execute command {' '.join(cmd)}")
+        # Disable proxy settings in a single adb shell roundtrip
+        cmd = [ADB_PATH, 'shell',
+               'settings put global http_proxy :0; '
+               'settings put global https_proxy :0']
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        if result.returncode != 0:
+            print(f"Warning: Failed to execute command {' '.join(cmd)}: "
+                  f"{result.stderr.decode('utf-8', 'replace').strip()}")
 
         print("Proxy routing disabled")
         return True
@@ -192,7 +359,7 @@ def disable_proxy_routing():
         print(f"Error disabling proxy routing: {e}")
         return False
 
-def handle_flutter_app(package_name, apk_path, mode='frida'):
+def handle_flutter_app(package_name, apk_path, mode='frida', is_flutter=None):
     """
     Handle a Flutter application with appropriate interception methods.
 
@@ -200,6 +367,8 @@ def handle_flutter_app(package_name, apk_path, mode='frida'):
         package_name (str): Package name of the Flutter app
         apk_path (str): Path to the APK file
         mode (str): Interception mode ('frida' or 'repackage')
+        is_flutter (bool): Precomputed detection result; when None the
+            APK is probed again
 
     Returns:
         dict: Results of the handling process
@@ -208,7 +377,7 @@ def handle_flutter_app(package_name, apk_path, mode='frida'):
 
     results = {
         'package': package_name,
-        'is_flutter': is_flutter_app(apk_path),
+        'is_flutter': is_flutter if is_flutter is not None else is_flutter_app(apk_path),
         'mode': mode,
         'interception_setup': False,
         'tls_bypass': False,
@@ -4,12 +4,36 @@ Auto APK Analyzer - Main Entry Point
 """
 
 import argparse
+import atexit
+import io
+import logging
 import os
 import sys
 import json
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+# Progress output goes through a block-buffered logger so large batches
+# don't pay one write syscall per line; the buffer is flushed on exit.
+# On a TTY the stream stays line-buffered for interactive feedback.
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    try:
+        _log_stream = io.TextIOWrapper(
+            open(sys.stdout.fileno(), 'wb', buffering=64 * 1024, closefd=False),
+            line_buffering=sys.stdout.isatty())
+        _log_handler = logging.StreamHandler(_log_stream)
+    except (OSError, ValueError, io.UnsupportedOperation):
+        # stdout has no usable file descriptor (e.g. captured in tests)
+        _log_handler = logging.StreamHandler(sys.stdout)
+    _log_handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(_log_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    atexit.register(_log_handler.flush)
+
 # Add src directory to Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
@@ -31,197 +55,231 @@ from utils.predefined_flows import (
 )
 
 # Import analysis modules
-from static.static_analyzer import run_jadx_extraction, run_apkleaks_scan, run_mobsf_scan
+from static.static_analyzer import run_all_static
 from dynamic.dynamic_analyzer import spawn_and_hook_app, setup_reqable_capture, stop_reqable_capture, collect_proxy_flows
 from component.component_enumerator import enumerate_components
-from flutter.flutter_handler import is_flutter_app, handle_flutter_app
+from flutter.flutter_handler import is_flutter_app_cached, handle_flutter_app
 from mapping.url_mapper import generate_url_map, save_url_map
 from utils.url_normalizer import merge_static_results
 
 def analyze_device_apps():
     """Analyze apps on connected device and organize by developer."""
-    print("Auto APK Analyzer - Device Analysis Mode")
-    print("========================================")
+    logger.info("Auto APK Analyzer - Device Analysis Mode")
+    logger.info("========================================")
 
     # Check if device is connected
     if not is_device_connected():
-        print("Error: No Android device connected via ADB")
+        logger.info("Error: No Android device connected via ADB")
         return False
 
-    print("Device connected successfully")
+    logger.info("Device connected successfully")
 
     # Create workspace manager
     workspace_manager = WorkspaceManager()
 
     # List third-party packages
-    print("Listing third-party packages...")
+    logger.info("Listing third-party packages...")
     packages = list_third_party_packages()
 
     if not packages:
-        print("No third-party packages found")
+        logger.info("No third-party packages found")
         return False
 
-    print(f"Found {len(packages)} third-party packages")
+    logger.info(f"Found {len(packages)} third-party packages")
 
     # Group apps by developer
-    print("Grouping apps by developer...")
+    logger.info("Grouping apps by developer...")
     developer_groups = group_apps_by_developer(packages)
 
-    print(f"Grouped into {len(developer_groups)} developer groups:")
+    logger.info(f"Grouped into {len(developer_groups)} developer groups:")
     for developer, app_list in developer_groups.items():
-        print(f"  {developer}: {len(app_list)} apps")
+        logger.info(f"  {developer}: {len(app_list)} apps")
 
     # Create workspaces for each developer
-    print("Creating workspaces...")
+    logger.info("Creating workspaces...")
     workspaces = workspace_manager.organize_apks_by_developer(developer_groups)
 
-    # Pull APKs for each developer group and analyze them
-    print("Pulling and analyzing APKs...")
-    for developer, app_list in developer_groups.items():
-        print(f"Processing apps for developer: {developer}")
-        dev_workspace = Path(workspaces[developer])
-
-        for package in app_list:
-            print(f"  Processing {package}...")
-            apk_path = get_apk_path(package)
-
-            if apk_path:
-                local_apk_path = dev_workspace / f"{package}.apk"
-                if pull_apk(apk_path, str(local_apk_path)):
-                    print(f"    Successfully pulled {package}")
-                    # Analyze the APK
-                    analyze_apk(str(local_apk_path), package, dev_workspace)
+    # Pull APKs for each developer group and analyze them. Pulls stay
+    # serialized because they contend on the single ADB connection, and
+    # each pulled APK's analysis is handed to a worker pool so transfers
+    # and analysis overlap. Only the static stage actually runs in
+    # parallel: inside analyze_apk the dynamic capture and component
+    # enumeration serialize on _device_lock, since concurrent workers
+    # would stop each other's Reqable capture and race over the single
+    # drozer server port.
+    logger.info("Pulling and analyzing APKs...")
+    futures = []
+    with ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1)) as executor:
+        for developer, app_list in developer_groups.items():
+            logger.info(f"Processing apps for developer: {developer}")
+            # Plain string paths avoid the intermediate PurePath objects
+            # that Path arithmetic allocates on every iteration
+            dev_workspace = workspaces[developer]
+
+            for package in app_list:
+                logger.info(f"  Processing {package}...")
+                apk_path = get_apk_path(package)
+
+                if apk_path:
+                    local_apk_path = os.path.join(dev_workspace, f"{package}.apk")
+                    if pull_apk(apk_path, local_apk_path):
+                        logger.info(f"    Successfully pulled {package}")
+                        # Analyze the APK
+                        futures.append(executor.submit(
+                            analyze_apk, local_apk_path, package, dev_workspace))
+                    else:
+                        logger.info(f"    Failed to pull {package}")
                 else:
-                    print(f"    Failed to pull {package}")
-            else:
-                print(f"    Failed to get APK path for {package}")
+                    logger.info(f"    Failed to get APK path for {package}")
 
-    print("\nDevice analysis complete!")
-    print(f"Workspaces created at: {workspace_manager.base_path}")
+        for future in as_completed(futures):
+            future.result()
+
+    logger.info("\nDevice analysis complete!")
+    logger.info(f"Workspaces created at: {workspace_manager.base_path}")
     return True
 
-def analyze_apk(apk_path, package_name, workspace_dir):
+# The dynamic and component stages own shared single-instance resources
+# (one Reqable proxy, one forwarded drozer port, one device UI); pooled
+# analyze_apk workers take this lock so those stages never interleave
+_device_lock = threading.Lock()
+
+def analyze_apk(apk_path, package_name, workspace_dir, flutter_override=None):
     """
     Perform complete analysis on a single APK.
 
     Args:
         apk_path (str): Path to the APK file
         package_name (str): Package name of the app
-        workspace_dir (Path): Workspace directory for results
+        workspace_dir (str or Path): Workspace directory for results
+        flutter_override (bool): Skip Flutter detection and force this
+            value when not None
     """
-    print(f"    Analyzing APK: {apk_path}")
+    logger.info(f"    Analyzing APK: {apk_path}")
 
     try:
         # Create results directory for this app
-        app_results_dir = workspace_dir / f"{package_name}_results"
-        app_results_dir.mkdir(exist_ok=True)
+        app_results_dir = os.path.join(str(workspace_dir), f"{package_name}_results")
+        os.makedirs(app_results_dir, exist_ok=True)
 
-        # Detect if app is Flutter-based
-        is_flutter = is_flutter_app(apk_path)
-        print(f"    Flutter app detected: {is_flutter}")
+        # Detect if app is Flutter-based unless the caller already knows
+        if flutter_override is not None:
+            is_flutter = flutter_override
+        else:
+            is_flutter = is_flutter_app_cached(apk_path)
+        logger.info(f"    Flutter app detected: {is_flutter}")
 
-        # Static Analysis
-        print("    Running static analysis...")
-        jadx_results = run_jadx_extraction(apk_path)
-        apkleaks_results = run_apkleaks_scan(apk_path)
-        mobsf_results = run_mobsf_scan(apk_path)
+        # Static Analysis - jadx, APKLeaks and MobSF run concurrently
+        logger.info("    Running static analysis...")
+        static_scans = run_all_static(apk_path)
+        jadx_results = static_scans['jadx']
+        apkleaks_results = static_scans['apkleaks']
+        mobsf_results = static_scans['mobsf']
 
         # Merge static analysis results
         static_results = merge_static_results(jadx_results, apkleaks_results, mobsf_results)
 
-        # Save static analysis results
-        static_results_file = app_results_dir / "static_results.json"
+        # Save static analysis results. Serialize to one string first -
+        # json.dump with indent issues many small writes per nested
+        # element, while a pre-built string lands in a single write
+        static_results_file = os.path.join(app_results_dir, "static_results.json")
         with open(static_results_file, 'w') as f:
-            json.dump(static_results, f, indent=2)
+            f.write(json.dumps(static_results, indent=2))
 
-        # Dynamic Analysis
+        # Dynamic Analysis and component enumeration both drive the one
+        # connected device, so pooled workers take turns here while
+        # their static stages keep running in parallel
         dynamic_results = []
         component_results = {}
 
-        if is_flutter:
-            # Special handling for Flutter apps
-            print("    Setting up Flutter interception...")
-            flutter_results = handle_flutter_app(package_name, apk_path, mode='frida')
-
-            # Run dynamic analysis with Flutter hooks
-            frida_process = spawn_and_hook_app(package_name, is_flutter=True)
-            if frida_process:
-                # Collect traffic flows
-                flows = collect_proxy_flows(duration=60)
-                dynamic_results.extend(flows)
-                frida_process.terminate()
-        else:
-            # Standard Android app handling
-            print("    Setting up standard interception...")
-            if setup_reqable_capture(package_name):
-                # Run Frida hook for certificate pinning bypass
-                frida_process = spawn_and_hook_app(package_name)
+        with _device_lock:
+            if is_flutter:
+                # Special handling for Flutter apps
+                logger.info("    Setting up Flutter interception...")
+                # Pass the detection result down so handle_flutter_app
+                # does not rescan the APK that was just probed
+                flutter_results = handle_flutter_app(package_name, apk_path, mode='frida',
+                                                     is_flutter=True)
+
+                # Run dynamic analysis with Flutter hooks
+                frida_process = spawn_and_hook_app(package_name, is_flutter=True)
                 if frida_process:
                     # Collect traffic flows
                     flows = collect_proxy_flows(duration=60)
                     dynamic_results.extend(flows)
                     frida_process.terminate()
-                    stop_reqable_capture()
-
-        # Component Enumeration
-        print("    Running component enumeration...")
-        component_results = enumerate_components(package_name)
+            else:
+                # Standard Android app handling
+                logger.info("    Setting up standard interception...")
+                if setup_reqable_capture(package_name):
+                    # Run Frida hook for certificate pinning bypass
+                    frida_process = spawn_and_hook_app(package_name)
+                    if frida_process:
+                        # Collect traffic flows
+                        flows = collect_proxy_flows(duration=60)
+                        dynamic_results.extend(flows)
+                        frida_process.terminate()
+                        stop_reqable_capture()
+
+            # Component Enumeration
+            logger.info("    Running component enumeration...")
+            component_results = enumerate_components(package_name)
 
         # Generate URL Map
-        print("    Generating URL map...")
+        logger.info("    Generating URL map...")
         url_map = generate_url_map(static_results, dynamic_results, component_results)
 
         # Save URL map
-        url_map_file = app_results_dir / "url_map.json"
-        save_url_map(url_map, str(url_map_file))
+        url_map_file = os.path.join(app_results_dir, "url_map.json")
+        save_url_map(url_map, url_map_file)
 
-        print(f"    Analysis complete for {package_name}")
-        print(f"    Results saved to: {app_results_dir}")
+        logger.info(f"    Analysis complete for {package_name}")
+        logger.info(f"    Results saved to: {app_results_dir}")
 
     except Exception as e:
-        print(f"    Error analyzing APK {apk_path}: {e}")
+        logger.info(f"    Error analyzing APK {apk_path}: {e}")
 
 def discover_apps_with_llm(query):
     """Discover apps using LLM services."""
-    print("Auto APK Analyzer - LLM App Discovery Mode")
-    print("==========================================")
+    logger.info("Auto APK Analyzer - LLM App Discovery Mode")
+    logger.info("==========================================")
 
-    print(f"Discovering apps based on query: {query}")
+    logger.info(f"Discovering apps based on query: {query}")
 
     # Create app discovery client
     discovery_client = AppDiscoveryClient()
 
     # Show which services are configured
-    print("\nConfigured LLM Services:")
+    logger.info("\nConfigured LLM Services:")
     configured_services = []
     for service_name, client in discovery_client.clients.items():
         if client.is_configured:
-            print(f"  {service_name}: Configured")
+            logger.info(f"  {service_name}: Configured")
             configured_services.append(service_name)
         else:
-            print(f"  {service_name}: Not configured")
+            logger.info(f"  {service_name}: Not configured")
 
     if not configured_services:
-        print("\nNo LLM services configured. Please add API keys to api_keys.json")
+        logger.info("\nNo LLM services configured. Please add API keys to api_keys.json")
         return False
 
     # Perform app discovery
-    print(f"\nQuerying configured services: {', '.join(configured_services)}")
+    logger.info(f"\nQuerying configured services: {', '.join(configured_services)}")
     results = discovery_client.discover_apps(query)
 
     # Display results
     for service, result in results.items():
-        print(f"\n{service.upper()} Results:")
-        print("-" * (len(service) + 9))
-        print(result)
-        print()
+        logger.info(f"\n{service.upper()} Results:")
+        logger.info("-" * (len(service) + 9))
+        logger.info(result)
+        logger.info("")
 
     return True
 
 def create_and_execute_flow(flow_id):
     """Create and execute a predefined flow."""
-    print(f"Auto APK Analyzer - Executing Flow: {flow_id}")
-    print("=" * 50)
+    logger.info(f"Auto APK Analyzer - Executing Flow: {flow_id}")
+    logger.info("=" * 50)
 
     # Initialize task manager
     task_manager = TaskManager()
@@ -229,45 +287,36 @@ def create_and_execute_flow(flow_id):
     # Get flow definition
     flow_def = get_flow_definition(flow_id)
     if not flow_def:
-        print(f"Error: Flow '{flow_id}' not found")
+        logger.info(f"Error: Flow '{flow_id}' not found")
         return False
 
     # Create the flow
     flow = task_manager.create_flow(flow_def["flow_id"], flow_def["name"], flow_def["description"])
-    print(f"Created flow: {flow.name}")
+    logger.info(f"Created flow: {flow.name}")
 
     # Get tasks for this flow
     tasks = get_tasks_for_flow(flow_id)
-    print(f"Flow contains {len(tasks)} tasks")
+    logger.info(f"Flow contains {len(tasks)} tasks")
 
-    # Create tasks
+    # Create tasks and their subtasks in one bulk registration so the
+    # whole flow persists with a single coalesced write
+    specs = []
     for task_def in tasks:
-        task = task_manager.create_task(
-            task_def["task_id"],
-            task_def["name"],
-            task_def["description"],
-            task_def["priority"]
-        )
-        task_manager.add_task_to_flow(flow_id, task_def["task_id"])
-        print(f"  Created task: {task.name}")
-
-        # Check for subtasks
-        subtasks = get_subtasks_for_task(task_def["task_id"])
-        for subtask_def in subtasks:
-            subtask = task_manager.create_task(
-                subtask_def["task_id"],
-                subtask_def["name"],
-                subtask_def["description"],
-                subtask_def["priority"],
-                parent_task_id=task_def["task_id"]
-            )
-            print(f"    Created subtask: {subtask.name}")
+        specs.append(task_def)
+        for subtask_def in get_subtasks_for_task(task_def["task_id"]):
+            specs.append({**subtask_def, "parent_task_id": task_def["task_id"]})
+
+    for task in task_manager.register_bulk(specs, flow_id=flow_id):
+        if task.parent_task_id:
+            logger.info(f"    Created subtask: {task.name}")
+        else:
+            logger.info(f"  Created task: {task.name}")
 
     # Display flow overview
     task_manager.print_flow_overview(flow_id)
 
     # Execute the flow (simplified implementation)
-    print(f"\nExecuting flow '{flow.name}'...")
+    logger.info(f"\nExecuting flow '{flow.name}'...")
     execute_flow(flow_id, task_manager)
 
     return True
@@ -284,9 +333,9 @@ def execute_flow(flow_id, task_manager):
         analyze_device_apps()
     elif flow_id == "llm_discovery":
         # This would require a query parameter
-        print("LLM discovery flow requires a query. Use --query parameter with --mode llm")
+        logger.info("LLM discovery flow requires a query. Use --query parameter with --mode llm")
     else:
-        print(f"Flow execution for '{flow_id}' not yet implemented")
+        logger.info(f"Flow execution for '{flow_id}' not yet implemented")
 
 def main():
     parser = argparse.ArgumentParser(description='Auto APK Analyzer - Discover hidden mobile APIs')
@@ -299,6 +348,8 @@ def main():
                         default='device', help='Analysis mode')
     parser.add_argument('--duration', '-d', type=int, default=300,
                         help='Duration for dynamic analysis in seconds')
+    parser.add_argument('--flutter', action=argparse.BooleanOptionalAction, default=None,
+                        help='Force Flutter handling on/off instead of probing the APK')
 
     args = parser.parse_args()
 
@@ -306,8 +357,8 @@ def main():
     if args.output:
         os.makedirs(args.output, exist_ok=True)
 
-    print("Auto APK Analyzer")
-    print("=================")
+    logger.info("Auto APK Analyzer")
+    logger.info("=================")
 
     # Flow execution mode
     if args.flow:
@@ -316,7 +367,7 @@ def main():
     # LLM discovery mode
     if args.mode == 'llm':
         if not args.query:
-            print("Error: --query is required for LLM discovery mode")
+            logger.info("Error: --query is required for LLM discovery mode")
             return False
         return discover_apps_with_llm(args.query)
 
@@ -327,25 +378,27 @@ def main():
     # File-based analysis
     if args.input:
         if os.path.isfile(args.input) and args.input.endswith('.apk'):
-            print(f"Analyzing single APK: {args.input}")
+            logger.info(f"Analyzing single APK: {args.input}")
             # Create a temporary workspace
             workspace = Path("./workspace/single_apk")
             workspace.mkdir(parents=True, exist_ok=True)
-            analyze_apk(args.input, "single_apk", workspace)
+            analyze_apk(args.input, "single_apk", workspace, flutter_override=args.flutter)
         elif os.path.isdir(args.input):
-            print(f"Analyzing APKs in directory: {args.input}")
-            # Analyze all APKs in the directory
-            for file in os.listdir(args.input):
-                if file.endswith('.apk'):
-                    apk_path = os.path.join(args.input, file)
-                    workspace = Path("./workspace/batch_analysis")
-                    workspace.mkdir(parents=True, exist_ok=True)
-                    analyze_apk(apk_path, file.replace('.apk', ''), workspace)
+            logger.info(f"Analyzing APKs in directory: {args.input}")
+            # Analyze all APKs in the directory; scandir streams entries
+            # instead of snapshotting the whole directory up front
+            workspace = Path("./workspace/batch_analysis")
+            workspace.mkdir(parents=True, exist_ok=True)
+            with os.scandir(args.input) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.name.endswith('.apk'):
+                        analyze_apk(entry.path, entry.name[:-4], workspace,
+                                    flutter_override=args.flutter)
         else:
-            print("Error: --input must be a valid APK file or directory")
+            logger.info("Error: --input must be a valid APK file or directory")
             return False
 
-    print("\nAnalysis complete.")
+    logger.info("\nAnalysis complete.")
     return True
 
 if __name__ == "__main__":
@@ -3,12 +3,38 @@
 URL Mapping Module for Auto APK Analyzer
 """
 
+import functools
 import json
+import sys
+import re
 import time
 from collections import defaultdict
 from urllib.parse import urlparse
 
-def create_url_mapping_entry(url, method='UNKNOWN', source='unknown', parameters=None):
+# URLs repeat across static, dynamic, and component sources during a
+# merge, so memoize the pure-Python parse
+_urlparse = functools.lru_cache(maxsize=1 << 16)(urlparse)
+
+# Risk indicators compiled once into a single case-insensitive
+# alternation, so each URL is scanned in one C-level pass instead of
+# eleven substring checks over a lowered copy
+RISK_RE = re.compile(
+    r'admin|login|auth|token|password|secret|key|config|debug|test|dev',
+    re.IGNORECASE
+)
+
+# Ordering of risk levels for merge comparisons, built once instead of
+# per merged entry
+_RISK_ORDER = {'LOW': 1, 'MEDIUM': 2, 'HIGH': 3}
+
+# Placeholder per parameter type for path templating
+_PARAM_PLACEHOLDERS = {
+    'uuid': '{uuid}',
+    'numeric_id': '{id}',
+    'alphanumeric_id': '{param}'
+}
+
+def create_url_mapping_entry(url, method='UNKNOWN', source='unknown', parameters=None, now=None):
     """
     Create a standardized URL mapping entry.
 
@@ -17,11 +43,15 @@ def create_url_mapping_entry(url, method='UNKNOWN', source='unknown', parameters
         method (str): HTTP method (GET, POST, etc.)
         source (str): Source of the URL (static, dynamic, component)
         parameters (list): List of parameters
+        now (float): Timestamp for first_seen/last_seen; callers
+            building many entries pass one shared value
 
     Returns:
         dict: URL mapping entry
     """
-    parsed = urlparse(url)
+    if now is None:
+        now = time.time()
+    parsed = _urlparse(url)
 
     # Extract path parameters and normalize
     normalized_path = parsed.path
@@ -29,44 +59,102 @@ def create_url_mapping_entry(url, method='UNKNOWN', source='unknown', parameters
 
     if parameters:
         path_params = parameters
-        # Replace actual values with placeholders in the path
+        # Replace actual values with placeholders in the path. The `in`
+        # guard skips str.replace's full scan when the value is absent,
+        # which is the common case for query-only parameters
         for param in parameters:
-            if param.get('type') == 'uuid':
-                normalized_path = normalized_path.replace(param['value'], '{uuid}')
-            elif param.get('type') == 'numeric_id':
-                normalized_path = normalized_path.replace(param['value'], '{id}')
-            elif param.get('type') == 'alphanumeric_id':
-                normalized_path = normalized_path.replace(param['value'], '{param}')
-
-    # Determine risk level
-    risk_level = 'LOW'
-    risk_indicators = [
-        'admin', 'login', 'auth', 'token', 'password', 'secret',
-        'key', 'config', 'debug', 'test', 'dev'
-    ]
-
-    for indicator in risk_indicators:
-        if indicator in url.lower():
-            risk_level = 'HIGH'
-            break
-        elif parameters and any(indicator in param.get('value', '').lower() for param in parameters):
-            risk_level = 'MEDIUM'
-            break
-
+            placeholder = _PARAM_PLACEHOLDERS.get(param.get('type'))
+            value = param.get('value')
+            if placeholder and value and value in normalized_path:
+                normalized_path = normalized_path.replace(value, placeholder)
+
+    # Determine risk level. Parameter values are joined and scanned in
+    # one pass rather than dispatching the regex per parameter
+    if RISK_RE.search(url):
+        risk_level = 'HIGH'
+    elif parameters and RISK_RE.search(
+            '\n'.join(param.get('value', '') for param in parameters)):
+        risk_level = 'MEDIUM'
+    else:
+        risk_level = 'LOW'
+
+    # Hosts, methods, sources, and signatures recur across thousands of
+    # entries; interning lets dict/set lookups compare by identity and
+    # shares one string object per distinct value
     return {
-        'signature': f"{parsed.netloc}{normalized_path}",
-        'host': parsed.netloc,
+        'signature': sys.intern(f"{parsed.netloc}{normalized_path}"),
+        'host': sys.intern(parsed.netloc),
         'path': normalized_path,
-        'method': method,
+        'method': sys.intern(method),
         'parameters': parameters or [],
-        'sources': [source],
-        'original_urls': [url],
+        'sources': {sys.intern(source)},
+        'original_urls': {url},
         'risk_level': risk_level,
-        'first_seen': time.time(),
-        'last_seen': time.time(),
+        'first_seen': now,
+        'last_seen': now,
+        'frequency': 1
+    }
+
+def _create_entry_no_params(url, method, source, now=None):
+    """
+    Fast-path entry builder for sources that carry no parameters.
+
+    Dynamic flows and component URIs never supply parameters, so this
+    skips the path templating loop and the parameter risk scan that
+    create_url_mapping_entry performs.
+
+    Args:
+        url (str): The URL
+        method (str): HTTP method
+        source (str): Source of the URL
+        now (float): Shared timestamp for first_seen/last_seen
+
+    Returns:
+        dict: URL mapping entry
+    """
+    if now is None:
+        now = time.time()
+    parsed = _urlparse(url)
+    return {
+        'signature': sys.intern(f"{parsed.netloc}{parsed.path}"),
+        'host': sys.intern(parsed.netloc),
+        'path': parsed.path,
+        'method': sys.intern(method),
+        'parameters': [],
+        'sources': {sys.intern(source)},
+        'original_urls': {url},
+        'risk_level': 'HIGH' if RISK_RE.search(url) else 'LOW',
+        'first_seen': now,
+        'last_seen': now,
         'frequency': 1
     }
 
+def _reduce_entry_group(group):
+    """
+    Reduce entries sharing one signature into a single merged entry.
+
+    Args:
+        group (list): Entries from create_url_mapping_entry, in source
+            order (static, then dynamic, then component)
+
+    Returns:
+        dict: The merged entry
+    """
+    merged = group[0]
+    for url_entry in group[1:]:
+        merged['sources'] |= url_entry['sources']
+        merged['original_urls'] |= url_entry['original_urls']
+        merged['parameters'].extend(url_entry['parameters'])
+        if url_entry['method'] != 'UNKNOWN':
+            merged['method'] = url_entry['method']
+        merged['frequency'] += url_entry['frequency']
+        merged['last_seen'] = max(merged['last_seen'], url_entry['last_seen'])
+
+        # Update risk level if needed
+        if _RISK_ORDER[url_entry['risk_level']] > _RISK_ORDER[merged['risk_level']]:
+            merged['risk_level'] = url_entry['risk_level']
+    return merged
+
 def merge_static_dynamic_data(static_results, dynamic_results, component_results=None):
     """
     Merge data from static, dynamic, and component analysis.
@@ -79,8 +167,14 @@ def merge_static_dynamic_data(static_results, dynamic_results, component_results
     Returns:
         dict: Merged URL mapping
     """
-    # Create a dictionary to hold merged entries
-    merged_entries = {}
+    # Group entries from all three sources by signature first (one hash
+    # probe plus an append per row), then reduce each group - typically
+    # one to three entries - in a single pass
+    groups = defaultdict(list)
+
+    # One timestamp for the whole merge; per-entry time.time() calls
+    # add up and the values would be indistinguishable anyway
+    now = time.time()
 
     # Process static analysis results
     if 'urls' in static_results:
@@ -89,48 +183,20 @@ def merge_static_dynamic_data(static_results, dynamic_results, component_results
                 entry.get('url', ''),
                 method='UNKNOWN',
                 source='static',
-                parameters=entry.get('parameters', [])
+                parameters=entry.get('parameters', []),
+                now=now
             )
-
-            signature = url_entry['signature']
-            if signature in merged_entries:
-                # Merge with existing entry
-                existing = merged_entries[signature]
-                existing['sources'].extend(url_entry['sources'])
-                existing['original_urls'].extend(url_entry['original_urls'])
-                existing['parameters'].extend(url_entry['parameters'])
-                existing['frequency'] += url_entry['frequency']
-                existing['last_seen'] = max(existing['last_seen'], url_entry['last_seen'])
-
-                # Update risk level if needed
-                risk_levels = {'LOW': 1, 'MEDIUM': 2, 'HIGH': 3}
-                if risk_levels[url_entry['risk_level']] > risk_levels[existing['risk_level']]:
-                    existing['risk_level'] = url_entry['risk_level']
-            else:
-                merged_entries[signature] = url_entry
+            groups[url_entry['signature']].append(url_entry)
 
     # Process dynamic analysis results
     for flow in dynamic_results:
-        url = flow.get('url', '')
-        method = flow.get('method', 'UNKNOWN')
-
-        url_entry = create_url_mapping_entry(
-            url,
-            method=method,
-            source='dynamic'
+        url_entry = _create_entry_no_params(
+            flow.get('url', ''),
+            flow.get('method', 'UNKNOWN'),
+            'dynamic',
+            now=now
         )
-
-        signature = url_entry['signature']
-        if signature in merged_entries:
-            # Merge with existing entry
-            existing = merged_entries[signature]
-            existing['sources'].extend(url_entry['sources'])
-            existing['original_urls'].extend(url_entry['original_urls'])
-            existing['method'] = method if method != 'UNKNOWN' else existing['method']
-            existing['frequency'] += url_entry['frequency']
-            existing['last_seen'] = max(existing['last_seen'], url_entry['last_seen'])
-        else:
-            merged_entries[signature] = url_entry
+        groups[url_entry['signature']].append(url_entry)
 
     # Process component enumeration results
     if component_results and 'providers' in component_results:
@@ -138,37 +204,36 @@ def merge_static_dynamic_data(static_results, dynamic_results, component_results
             if provider.get('accessible', False):
                 uri = provider.get('uri', '')
                 if uri:
-                    url_entry = create_url_mapping_entry(
+                    url_entry = _create_entry_no_params(
                         f"content://{uri}",
-                        method='CONTENT_PROVIDER',
-                        source='component'
+                        'CONTENT_PROVIDER',
+                        'component',
+                        now=now
                     )
-
-                    signature = url_entry['signature']
-                    if signature in merged_entries:
-                        # Merge with existing entry
-                        existing = merged_entries[signature]
-                        existing['sources'].extend(url_entry['sources'])
-                        existing['original_urls'].extend(url_entry['original_urls'])
-                        existing['method'] = 'CONTENT_PROVIDER'
-                        existing['frequency'] += url_entry['frequency']
-                        existing['last_seen'] = max(existing['last_seen'], url_entry['last_seen'])
-                    else:
-                        merged_entries[signature] = url_entry
-
-    # Remove duplicates from sources and original_urls
-    for entry in merged_entries.values():
-        entry['sources'] = list(set(entry['sources']))
-        entry['original_urls'] = list(set(entry['original_urls']))
+                    groups[url_entry['signature']].append(url_entry)
+
+    # Reduce straight into the result list; the grouping dict above is
+    # the only signature index needed, so no second keyed copy is built
+    entries = [_reduce_entry_group(group) for group in groups.values()]
+
+    # Sets deduplicated as entries accumulated; convert to lists once
+    # for the JSON-facing result. Parameters are dicts, so dedupe them
+    # by their (type, value) identity here
+    for entry in entries:
+        entry['sources'] = list(entry['sources'])
+        entry['original_urls'] = list(entry['original_urls'])
+        if entry['parameters']:
+            unique_params = {(p.get('type'), p.get('value')): p for p in entry['parameters']}
+            entry['parameters'] = list(unique_params.values())
 
     return {
-        'entries': list(merged_entries.values()),
+        'entries': entries,
         'domains': static_results.get('domains', []),
         'endpoints': static_results.get('endpoints', []),
         'secrets': static_results.get('secrets', []),
         'permissions': static_results.get('permissions', []),
         'certificates': static_results.get('certificates', []),
-        'timestamp': time.time()
+        'timestamp': now
     }
 
 def generate_url_map(static_results, dynamic_results, component_results=None):
@@ -219,19 +284,26 @@ def generate_url_map(static_results, dynamic_results, component_results=None):
 
 def save_url_map(url_map, output_path):
     """
-    Save URL map to a JSON file.
+    Save URL map to a JSON file or open file-like object.
 
     Args:
         url_map (dict): URL map to save
-        output_path (str): Path to save the file
+        output_path (str or file-like): Path to save the file, or any
+            object with a write() method (which is not closed here)
 
     Returns:
         bool: True if successful, False otherwise
     """
     try:
-        with open(output_path, 'w') as f:
-            json.dump(url_map, f, indent=2)
-        print(f"URL map saved to {output_path}")
+        # Serialize to one string first; json.dump with indent writes
+        # the file in many small chunks
+        data = json.dumps(url_map, indent=2)
+        if hasattr(output_path, 'write'):
+            output_path.write(data)
+        else:
+            with open(output_path, 'w') as f:
+                f.write(data)
+            print(f"URL map saved to {output_path}")
         return True
     except Exception as e:
         print(f"Error saving URL map: {e}")
@@ -239,15 +311,18 @@ def save_url_map(url_map, output_path):
 
 def load_url_map(input_path):
     """
-    Load URL map from a JSON file.
+    Load URL map from a JSON file or open file-like object.
 
     Args:
-        input_path (str): Path to the file
+        input_path (str or file-like): Path to the file, or any object
+            with a read() method (which is not closed here)
 
     Returns:
         dict: Loaded URL map, or None if failed
     """
     try:
+        if hasattr(input_path, 'read'):
+            return json.load(input_path)
         with open(input_path, 'r') as f:
             url_map = json.load(f)
         print(f"URL map loaded from {input_path}")
@@ -256,13 +331,19 @@ def load_url_map(input_path):
         print(f"Error loading URL map: {e}")
         return None
 
-def compare_url_maps(old_map, new_map):
+def compare_url_maps(old_map, new_map, include_unchanged=True):
     """
     Compare two URL maps to identify changes.
 
+    The signature lists come back sorted so repeated comparisons of the
+    same maps produce identical reports. The unchanged set is usually
+    the largest by far; callers that only need the delta can skip
+    materializing it.
+
     Args:
         old_map (dict): Old URL map
         new_map (dict): New URL map
+        include_unchanged (bool): Include the full unchanged list
 
     Returns:
         dict: Comparison results
@@ -274,16 +355,18 @@ def compare_url_maps(old_map, new_map):
     removed = old_signatures - new_signatures
     unchanged = old_signatures & new_signatures
 
-    return {
-        'added': list(added),
-        'removed': list(removed),
-        'unchanged': list(unchanged),
+    comparison = {
+        'added': sorted(added),
+        'removed': sorted(removed),
         'summary': {
             'added_count': len(added),
             'removed_count': len(removed),
             'unchanged_count': len(unchanged)
         }
     }
+    if include_unchanged:
+        comparison['unchanged'] = sorted(unchanged)
+    return comparison
 
 # Example usage
 if __name__ == "__main__":
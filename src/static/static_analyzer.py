@@ -3,11 +3,18 @@
 Static Analysis Module for Auto APK Analyzer
 """
 
+import functools
 import subprocess
+import mmap
 import os
 import json
 import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
+from urllib.parse import urlparse
+
+# MobSF reports repeat hosts heavily; memoize the pure-Python parse
+_urlparse = functools.lru_cache(maxsize=1 << 16)(urlparse)
 
 # Load configuration
 config = {}
@@ -22,6 +29,81 @@ JADX_PATH = config.get('tools', {}).get('jadx', 'jadx')
 APKLEAKS_PATH = config.get('tools', {}).get('apkleaks', 'apkleaks')
 MOBSF_PATH = config.get('tools', {}).get('mobsf', 'mobsf')
 
+# URL and domain patterns, compiled once at module scope so worker
+# processes resolve them by name instead of re-compiling per file.
+# Compiled over bytes: the scan runs on raw file contents and only the
+# matches themselves are decoded, skipping a full UTF-8 pass per file
+URL_PATTERN = re.compile(
+    rb'https?://[-\w.]+(?::\d+)?(?:/[\w/_.%~\-]*(?:\?[\w&=%.+\-]*)?(?:#[\w.\-]*)?)?'
+)
+DOMAIN_PATTERN = re.compile(
+    rb'(?:https?://)?[-\w.]+\.[A-Za-z]{2,}'
+)
+
+# File types worth scanning in the JADX output tree
+SCANNABLE_SUFFIXES = frozenset({'.txt', '.xml', '.json', '.js', '.html', '.cfg', ''})
+
+# Patterns for the APKLeaks plain-text fallback parser
+_APKLEAKS_URL_RE = re.compile(r'https?://[^\s]+')
+_APKLEAKS_ENDPOINT_RE = re.compile(r'/(?:[^\s/]+/)*[^\s]*')
+
+def _iter_scannable_files(root):
+    """
+    Yield scannable file paths under a directory tree.
+
+    Walks with os.scandir so file/dir type comes from the directory
+    entry itself instead of a stat call per path, and no Path objects
+    are allocated.
+
+    Args:
+        root (str): Directory to walk
+
+    Yields:
+        str: Paths of files whose suffix is in SCANNABLE_SUFFIXES
+    """
+    stack = [str(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        if os.path.splitext(entry.name)[1] in SCANNABLE_SUFFIXES:
+                            yield entry.path
+        except OSError as e:
+            print(f"Error walking {root}: {e}")
+
+def _scan_file(file_path):
+    """
+    Scan a single JADX output file for URLs and domains.
+
+    Args:
+        file_path (str): Path to the file to scan
+
+    Returns:
+        tuple: (urls, domains) lists found in the file
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return [], []
+            # Map the file instead of copying it into a bytes object;
+            # the kernel streams pages through the regex scan and can
+            # evict them afterwards
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                urls = [m.decode('utf-8', 'ignore') for m in URL_PATTERN.findall(mm)]
+                domains = [d.replace(b'http://', b'').replace(b'https://', b'').decode('utf-8', 'ignore')
+                           for d in DOMAIN_PATTERN.findall(mm)]
+            finally:
+                mm.close()
+    except Exception as e:
+        print(f"Error reading {file_path}: {e}")
+        return [], []
+
+    return urls, domains
+
 def run_jadx_extraction(apk_path):
     """
     Run JADX to extract strings and potential URLs from an APK.
@@ -51,11 +133,14 @@ def run_jadx_extraction(apk_path):
         ]
 
         print(f"Executing: {' '.join(jadx_cmd)}")
-        result = subprocess.run(jadx_cmd, capture_output=True, text=True, timeout=300)
+        # JADX logs thousands of lines on big APKs; the output is never
+        # inspected, so only stderr is kept for the failure diagnostic
+        result = subprocess.run(jadx_cmd, stdout=subprocess.DEVNULL,
+                                stderr=subprocess.PIPE, timeout=300)
 
         if result.returncode != 0:
             print(f"JADX failed with return code {result.returncode}")
-            print(f"Error: {result.stderr}")
+            print(f"Error: {result.stderr.decode('utf-8', 'replace')}")
             return {"urls": [], "domains": [], "endpoints": [], "error": "JADX failed"}
 
         # Extract URLs from JADX output
@@ -87,43 +172,22 @@ def extract_urls_from_jadx_output(jadx_output_dir):
     Returns:
         tuple: (urls, domains) lists
     """
-    urls = []
-    domains = []
-
-    # URL regex pattern
-    url_pattern = re.compile(
-        r'https?://(?:[-\w.])+(?:[:\d]+)?(?:/(?:[\w/_.])*(?:\?(?:[\w&=%.])*)?(?:#(?:[\w.])*)?)?'
-    )
-
-    # Domain regex pattern
-    domain_pattern = re.compile(
-        r'(?:https?://)?(?:[-\w.])+(?:\.[a-zA-Z]{2,})'
-    )
-
-    # Search for URLs in all text files in JADX output
-    for file_path in jadx_output_dir.rglob('*'):
-        if file_path.is_file() and file_path.suffix in ['.txt', '.xml', '.json', '.js', '.html', '.cfg', '']:
-            try:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-
-                    # Find URLs
-                    found_urls = url_pattern.findall(content)
-                    urls.extend(found_urls)
+    urls = set()
+    domains = set()
 
-                    # Find domains
-                    found_domains = domain_pattern.findall(content)
-                    domains.extend([d.replace('http://', '').replace('https://', '') for d in found_domains])
+    # Collect scannable files, then fan the regex work out across cores -
+    # a decompiled APK yields thousands of independent files
+    file_paths = list(_iter_scannable_files(jadx_output_dir))
 
-            except Exception as e:
-                print(f"Error reading {file_path}: {e}")
-                continue
+    if not file_paths:
+        return [], []
 
-    # Remove duplicates
-    urls = list(set(urls))
-    domains = list(set(domains))
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for found_urls, found_domains in executor.map(_scan_file, file_paths, chunksize=32):
+            urls.update(found_urls)
+            domains.update(found_domains)
 
-    return urls, domains
+    return list(urls), list(domains)
 
 def run_apkleaks_scan(apk_path):
     """
@@ -153,11 +217,12 @@ def run_apkleaks_scan(apk_path):
         ]
 
         print(f"Executing: {' '.join(apkleaks_cmd)}")
-        result = subprocess.run(apkleaks_cmd, capture_output=True, text=True, timeout=300)
+        result = subprocess.run(apkleaks_cmd, stdout=subprocess.DEVNULL,
+                                stderr=subprocess.PIPE, timeout=300)
 
         if result.returncode != 0:
             print(f"APKLeaks failed with return code {result.returncode}")
-            print(f"Error: {result.stderr}")
+            print(f"Error: {result.stderr.decode('utf-8', 'replace')}")
             # Clean up temporary file
             if os.path.exists(output_file):
                 os.remove(output_file)
@@ -190,9 +255,11 @@ def parse_apkleaks_output_file(output_file):
         dict: Parsed results
     """
     try:
-        # Read the output file
-        with open(output_file, 'r') as f:
-            data = json.load(f)
+        # Read the output file in binary and hand the whole buffer to the
+        # parser; this skips the text-wrapper decode layer and lets
+        # json.loads run its C scanner over one contiguous buffer
+        with open(output_file, 'rb') as f:
+            data = json.loads(f.read())
 
         results = {
             "urls": [],
@@ -255,34 +322,76 @@ def parse_apkleaks_output(output):
         return results
 
     except json.JSONDecodeError:
-        # If not JSON, try to parse as text
-        lines = output.split('\n')
-        urls = []
-        endpoints = []
-        secrets = []
-
-        url_pattern = re.compile(r'https?://[^\s]+')
-        endpoint_pattern = re.compile(r'/(?:[^\s/]+/)*[^\s]*')
-
-        for line in lines:
-            # Extract URLs
-            found_urls = url_pattern.findall(line)
-            urls.extend(found_urls)
-
-            # Extract potential endpoints
-            found_endpoints = endpoint_pattern.findall(line)
-            endpoints.extend(found_endpoints)
-
-        # Remove duplicates
-        urls = list(set(urls))
-        endpoints = list(set(endpoints))
+        # If not JSON, try to parse as text. Both patterns stop at
+        # whitespace, so one pass over the whole buffer finds the same
+        # matches as the old line loop without splitting the output
+        # into a list of lines, and the set comprehensions dedupe as
+        # matches arrive
+        urls = list({m.group() for m in _APKLEAKS_URL_RE.finditer(output)})
+        endpoints = list({m.group() for m in _APKLEAKS_ENDPOINT_RE.finditer(output)})
 
         return {
             "urls": urls,
             "endpoints": endpoints,
-            "secrets": secrets
+            "secrets": []
         }
 
+def _wait_for_mobsf_ready(base_url, timeout=30):
+    """
+    Poll the MobSF server until it answers HTTP, with backoff.
+
+    Args:
+        base_url (str): Server URL to probe
+        timeout (int): Maximum seconds to wait
+
+    Returns:
+        bool: True once the server responds, False on timeout
+    """
+    import requests
+    import time
+
+    deadline = time.time() + timeout
+    delay = 0.2
+    while time.time() < deadline:
+        try:
+            if requests.get(base_url, timeout=1).status_code < 500:
+                return True
+        except Exception:
+            pass
+        time.sleep(delay)
+        delay = min(delay * 1.5, 2)
+    return False
+
+def _wait_for_mobsf_report(scan_hash, timeout=300):
+    """
+    Poll the MobSF report endpoint until the scan has finished.
+
+    Args:
+        scan_hash (str): Hash returned by the upload endpoint
+        timeout (int): Maximum seconds to wait
+
+    Returns:
+        dict: Report JSON, or None on timeout
+    """
+    import requests
+    import time
+
+    deadline = time.time() + timeout
+    delay = 0.5
+    while time.time() < deadline:
+        try:
+            response = requests.get('http://127.0.0.1:8000/api/v1/report_json',
+                                    params={'hash': scan_hash}, timeout=5)
+            if response.status_code == 200:
+                report = response.json()
+                if report.get('app_name') or report.get('urls') is not None:
+                    return report
+        except Exception:
+            pass
+        time.sleep(delay)
+        delay = min(delay * 1.5, 5)
+    return None
+
 def run_mobsf_scan(apk_path):
     """
     Run MobSF scan on an APK (requires MobSF server).
@@ -306,8 +415,11 @@ def run_mobsf_scan(apk_path):
             "-b", "127.0.0.1:8000"
         ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
-        # Wait for server to start
-        time.sleep(10)
+        # Wait for the server to come up instead of sleeping a fixed 10s
+        if not _wait_for_mobsf_ready('http://127.0.0.1:8000'):
+            print("MobSF server did not become ready")
+            mobsf_process.terminate()
+            return {"urls": [], "domains": [], "certificates": [], "permissions": [], "error": "Server not ready"}
 
         # Upload APK file
         with open(apk_path, 'rb') as f:
@@ -336,19 +448,15 @@ def run_mobsf_scan(apk_path):
             mobsf_process.terminate()
             return {"urls": [], "domains": [], "certificates": [], "permissions": [], "error": "Scan start failed"}
 
-        # Wait for scan to complete
-        time.sleep(30)
+        # Poll for the report until the scan completes instead of a
+        # fixed 30s sleep; small APKs finish in a few seconds
+        report_data = _wait_for_mobsf_report(scan_hash)
 
-        # Get scan results
-        report_response = requests.get(f'http://127.0.0.1:8000/api/v1/report_json', params={'hash': scan_hash})
-
-        if report_response.status_code != 200:
-            print(f"Failed to get MobSF report: {report_response.status_code}")
+        if report_data is None:
+            print("Failed to get MobSF report: scan did not complete in time")
             mobsf_process.terminate()
             return {"urls": [], "domains": [], "certificates": [], "permissions": [], "error": "Report failed"}
 
-        report_data = report_response.json()
-
         # Extract relevant information from report
         results = {
             "urls": [],
@@ -368,8 +476,7 @@ def run_mobsf_scan(apk_path):
                 results['urls'].append(url)
                 # Extract domain from URL
                 try:
-                    from urllib.parse import urlparse
-                    parsed = urlparse(url)
+                    parsed = _urlparse(url)
                     if parsed.netloc:
                         results['domains'].append(parsed.netloc)
                 except:
@@ -392,14 +499,34 @@ def run_mobsf_scan(apk_path):
             pass
         return {"urls": [], "domains": [], "certificates": [], "permissions": [], "error": str(e)}
 
+def run_all_static(apk_path):
+    """
+    Run JADX, APKLeaks, and MobSF scans on an APK concurrently.
+
+    The three tools are independent subprocesses reading the same APK,
+    so static wall time becomes the slowest tool instead of the sum.
+    Threads suffice since each wrapper blocks on an external process.
+
+    Args:
+        apk_path (str): Path to the APK file
+
+    Returns:
+        dict: Results keyed by tool name ('jadx', 'apkleaks', 'mobsf')
+    """
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = {
+            executor.submit(run_jadx_extraction, apk_path): 'jadx',
+            executor.submit(run_apkleaks_scan, apk_path): 'apkleaks',
+            executor.submit(run_mobsf_scan, apk_path): 'mobsf'
+        }
+        return {futures[future]: future.result() for future in as_completed(futures)}
+
 # Example usage
 if __name__ == "__main__":
     # This would typically be called with an actual APK path
     sample_apk = "sample.apk"
     print("Running static analysis modules...")
 
-    jadx_results = run_jadx_extraction(sample_apk)
-    print("JADX Results:", json.dumps(jadx_results, indent=2))
-
-    apkleaks_results = run_apkleaks_scan(sample_apk)
-    print("APKLeaks Results:", json.dumps(apkleaks_results, indent=2))
\ No newline at end of file
+    static_results = run_all_static(sample_apk)
+    print("JADX Results:", json.dumps(static_results['jadx'], indent=2))
+    print("APKLeaks Results:", json.dumps(static_results['apkleaks'], indent=2))
\ No newline at end of file
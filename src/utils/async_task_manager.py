@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Asyncio front-end for the Task Manager
+"""
+
+import asyncio
+from typing import List, Optional, Tuple
+
+from .task_manager import Task, TaskManager, TaskPriority, TaskStatus
+
+# Event name queued for every task that reaches COMPLETED
+TASK_COMPLETED = "TASK_COMPLETED"
+
+class AsyncTaskManager:
+    """
+    Event-loop-friendly wrapper around TaskManager.
+
+    Mutations run through asyncio.to_thread so an orchestrator driving
+    parallel ADB or LLM work never blocks its loop on task bookkeeping
+    or the persistence layer behind it. Every task that transitions to
+    COMPLETED - including parents closed by their last subtask - emits
+    a (TASK_COMPLETED, task_id) tuple onto `events`, which a scheduler
+    coroutine can consume to dispatch newly-ready work.
+    """
+
+    def __init__(self, workspace_path: str = "./workspace"):
+        self._manager = TaskManager(workspace_path)
+        self.events: "asyncio.Queue[Tuple[str, str]]" = asyncio.Queue()
+
+    @property
+    def tasks(self):
+        return self._manager.tasks
+
+    @property
+    def flows(self):
+        return self._manager.flows
+
+    async def create_task(self, task_id: str, name: str, description: str,
+                          priority: TaskPriority = TaskPriority.MEDIUM,
+                          parent_task_id: Optional[str] = None) -> Task:
+        """Create a new task without blocking the event loop."""
+        return await asyncio.to_thread(self._manager.create_task, task_id,
+                                       name, description, priority,
+                                       parent_task_id)
+
+    async def create_flow(self, flow_id: str, name: str, description: str):
+        """Create a new flow without blocking the event loop."""
+        return await asyncio.to_thread(self._manager.create_flow, flow_id,
+                                       name, description)
+
+    async def add_task_to_flow(self, flow_id: str, task_id: str):
+        """Add a task to a flow without blocking the event loop."""
+        await asyncio.to_thread(self._manager.add_task_to_flow, flow_id, task_id)
+
+    async def start_task(self, task_id: str):
+        """Start a task without blocking the event loop."""
+        await asyncio.to_thread(self._manager.start_task, task_id)
+
+    async def complete_task(self, task_id: str):
+        """
+        Complete a task and publish completion events.
+
+        Only the triggering task's parent is inspected afterwards, so
+        event emission costs one status read rather than a walk over
+        the task table.
+        """
+        task = self._manager.tasks.get(task_id)
+        parent_id = task.parent_task_id if task else None
+        parent_was_completed = (
+            parent_id in self._manager.tasks
+            and self._manager.tasks[parent_id].status == TaskStatus.COMPLETED
+        )
+
+        await asyncio.to_thread(self._manager.complete_task, task_id)
+
+        if task and task.status == TaskStatus.COMPLETED:
+            await self.events.put((TASK_COMPLETED, task_id))
+        if (parent_id in self._manager.tasks and not parent_was_completed
+                and self._manager.tasks[parent_id].status == TaskStatus.COMPLETED):
+            await self.events.put((TASK_COMPLETED, parent_id))
+
+    async def fail_task(self, task_id: str, error_message: str = ""):
+        """Fail a task without blocking the event loop."""
+        await asyncio.to_thread(self._manager.fail_task, task_id, error_message)
+
+    def list_tasks(self, status: Optional[TaskStatus] = None) -> List[Task]:
+        """List tasks; a pure in-memory read, no thread hop needed."""
+        return self._manager.list_tasks(status)
+
+    async def flush(self):
+        """Wait for every queued mutation to reach the log."""
+        await asyncio.to_thread(self._manager.flush)
+
+    async def compact(self):
+        """Rewrite the snapshots and truncate the log."""
+        await asyncio.to_thread(self._manager.compact)
+
+    async def close(self):
+        """Drain pending records and shut the persistence layer down."""
+        await asyncio.to_thread(self._manager.close)
+
+# Example usage
+if __name__ == "__main__":
+    async def main():
+        atm = AsyncTaskManager()
+        await atm.create_task("scan_001", "Device Scan", "Scan device")
+        await atm.create_task("pull_001", "Pull APKs", "Pull APK files",
+                              parent_task_id="scan_001")
+        await atm.complete_task("pull_001")
+        while not atm.events.empty():
+            print(await atm.events.get())
+        await atm.close()
+
+    asyncio.run(main())
@@ -3,37 +3,113 @@
 Device Management Utilities for Auto APK Analyzer
 """
 
+import functools
+import shutil
 import subprocess
 import os
 import re
-import json
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 
-# Load configuration
-config = {}
-try:
-    with open(os.path.join(os.path.dirname(__file__), '..', '..', 'config.json')) as f:
-        config = json.load(f)
-except FileNotFoundError:
-    print("Warning: config.json not found, using default paths")
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from config_cache import get_config
+
+# Load configuration through the shared cache (one parse per process)
+config = get_config()
 
 # Get ADB path from config or use default
 ADB_PATH = config.get('tools', {}).get('adb', 'adb')
 
+# Resolve the adb binary to an absolute path once, so each invocation
+# skips the per-exec PATH search
+ADB_PATH = shutil.which(ADB_PATH) or ADB_PATH
+
+# Vendors whose second package label alone identifies the developer
+_KNOWN_VENDORS = frozenset({'google', 'microsoft', 'facebook', 'twitter', 'instagram'})
+
+# Matches "package:/path/base.apk=com.example.app" from `list packages -f`
+# and plain "package:com.example.app" from the path-less variant. The
+# split has to happen on the LAST '=': Android 11+ install paths embed
+# base64 padding (/data/app/~~dQbj...tg==/...), so the path group is
+# greedy and the package group excludes '='
+_PACKAGE_LINE_RE = re.compile(r'^package:(?:(.+)=)?([^=\s]+)$')
+
+# Extracts the path from `pm path` output without strip/split lists
+_PM_PATH_RE = re.compile(r'^package:(.+)$', re.MULTILINE)
+
+# APK paths learned from the single list-packages round-trip, so
+# get_apk_path does not need its own adb invocation per package
+_apk_path_cache = {}
+
+# Package inventory rarely changes within a session, so successful
+# listings are reused for a short window, keyed to the device serial so
+# a swapped device never serves stale results
+_pkg_cache = {'serial': None, 'ts': 0.0, 'packages': []}
+CACHE_TTL = 30
+
+# Directories already created by pull_apk; batch pulls into one parent
+# pay the makedirs stat walk only once
+_ensured_dirs = set()
+
+def _device_serial():
+    """
+    Read the serial of the connected device, or None if unavailable.
+
+    Returns:
+        str: Device serial number, or None
+    """
+    try:
+        result = subprocess.run([ADB_PATH, 'shell', 'getprop', 'ro.serialno'],
+                              capture_output=True, text=True, check=True)
+        return result.stdout.strip() or None
+    except subprocess.CalledProcessError:
+        return None
+
+def invalidate_cache():
+    """
+    Drop the cached package inventory and APK paths.
+
+    Call after any install or uninstall so the next listing reflects
+    the device again.
+    """
+    _pkg_cache['serial'] = None
+    _pkg_cache['ts'] = 0.0
+    _pkg_cache['packages'] = []
+    _apk_path_cache.clear()
+
 def list_third_party_packages():
     """
     List all third-party packages installed on the connected device.
 
+    Uses one `pm list packages -3 -f` round-trip so the APK path of
+    every package arrives alongside its name, instead of a follow-up
+    `pm path` invocation per package.
+
     Returns:
         list: List of package names
     """
+    serial = _device_serial()
+    if (_pkg_cache['packages'] and serial and serial == _pkg_cache['serial']
+            and time.monotonic() - _pkg_cache['ts'] < CACHE_TTL):
+        return list(_pkg_cache['packages'])
+
     try:
-        result = subprocess.run([ADB_PATH, 'shell', 'pm', 'list', 'packages', '-3'],
+        result = subprocess.run([ADB_PATH, 'shell', 'pm', 'list', 'packages', '-3', '-f'],
                               capture_output=True, text=True, check=True)
         packages = []
         for line in result.stdout.strip().split('\n'):
-            if line.startswith('package:'):
-                package_name = line.split(':')[1]
+            match = _PACKAGE_LINE_RE.match(line)
+            if match:
+                apk_path, package_name = match.groups()
+                if apk_path:
+                    _apk_path_cache[package_name] = apk_path
                 packages.append(package_name)
+        if packages:
+            _pkg_cache['serial'] = serial
+            _pkg_cache['ts'] = time.monotonic()
+            _pkg_cache['packages'] = list(packages)
         return packages
     except subprocess.CalledProcessError as e:
         print(f"Error listing packages: {e}")
@@ -43,17 +119,25 @@ def get_apk_path(package_name):
     """
     Get the APK path for a given package name.
 
+    Answers from the cache filled by list_third_party_packages when
+    possible; only unseen packages cost an adb round-trip.
+
     Args:
         package_name (str): Name of the package
 
     Returns:
         str: Path to the APK file on the device, or None if not found
     """
+    cached = _apk_path_cache.get(package_name)
+    if cached:
+        return cached
     try:
         result = subprocess.run([ADB_PATH, 'shell', 'pm', 'path', package_name],
                               capture_output=True, text=True, check=True)
-        if result.stdout.startswith('package:'):
-            apk_path = result.stdout.strip().split(':')[1]
+        match = _PM_PATH_RE.search(result.stdout)
+        if match:
+            apk_path = match.group(1).strip()
+            _apk_path_cache[package_name] = apk_path
             return apk_path
         return None
     except subprocess.CalledProcessError as e:
@@ -72,16 +156,49 @@ def pull_apk(apk_path, local_path):
         bool: True if successful, False otherwise
     """
     try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(local_path), exist_ok=True)
-
-        result = subprocess.run([ADB_PATH, 'pull', apk_path, local_path],
-                              capture_output=True, text=True, check=True)
+        # Create directory if it doesn't exist, skipping the syscalls
+        # for parents this process has already ensured
+        parent_dir = os.path.dirname(local_path)
+        if parent_dir not in _ensured_dirs:
+            os.makedirs(parent_dir, exist_ok=True)
+            _ensured_dirs.add(parent_dir)
+
+        # Stream the file straight into the local destination with
+        # exec-out; unlike adb pull this bypasses the device-side
+        # scoped-storage copy layers on paths that traverse them
+        with open(local_path, 'wb') as f:
+            subprocess.run([ADB_PATH, 'exec-out', 'cat', apk_path],
+                          stdout=f, stderr=subprocess.PIPE, check=True)
         return True
-    except subprocess.CalledProcessError as e:
+    except (OSError, subprocess.CalledProcessError) as e:
         print(f"Error pulling APK from {apk_path}: {e}")
+        # Drop any partial file so callers never analyze a truncated APK
+        try:
+            os.remove(local_path)
+        except OSError:
+            pass
         return False
 
+def pull_apks(items, workers=4):
+    """
+    Pull several APKs from the device concurrently.
+
+    Each pull spends most of its time on process startup and the adb
+    handshake rather than bulk transfer, so overlapping them from a
+    small thread pool raises throughput for batches of packages.
+
+    Args:
+        items (list): (device_path, local_path) tuples
+        workers (int): Number of concurrent pulls
+
+    Returns:
+        list: Per-item success flags, in input order
+    """
+    if not items:
+        return []
+    with ThreadPoolExecutor(max_workers=min(workers, len(items))) as executor:
+        return list(executor.map(lambda item: pull_apk(*item), items))
+
 def is_device_connected():
     """
     Check if an Android device is connected via ADB.
@@ -101,31 +218,54 @@ def is_device_connected():
     except subprocess.CalledProcessError:
         return False
 
+@functools.lru_cache(maxsize=1024)
+def _detect_flutter_memo(apk_path, size, mtime_ns):
+    """
+    Memoized Flutter detection keyed to the file's identity.
+
+    Detection is deterministic from the APK bytes, so the size and
+    mtime in the key make cached answers safe across re-analysis of
+    the same file while a rewritten APK misses and is re-scanned.
+
+    Args:
+        apk_path (str): Path to the APK file
+        size (int): File size in bytes
+        mtime_ns (int): File modification time in nanoseconds
+
+    Returns:
+        bool: True if the app appears to be a Flutter application
+    """
+    # Read the zip central directory in-process; this looks only at
+    # entry names and short-circuits on the first Flutter marker
+    # instead of forking unzip and grepping its full textual listing
+    try:
+        with zipfile.ZipFile(apk_path) as z:
+            return any(
+                'flutter_assets' in name or name.endswith('libflutter.so')
+                for name in z.namelist()
+            )
+    except (OSError, zipfile.BadZipFile):
+        # If the APK cannot be read, we can't determine if it's Flutter
+        return False
+
 def detect_flutter_app(apk_path):
     """
     Detect if an APK is a Flutter application.
 
+    Repeat detections of an unchanged file answer from an in-process
+    cache without touching the zip again.
+
     Args:
         apk_path (str): Path to the APK file
 
     Returns:
         bool: True if the app appears to be a Flutter application, False otherwise
     """
-    # This is a simplified detection method
-    # In a real implementation, we would check the APK contents
     try:
-        # Check if the APK contains flutter_assets directory
-        result = subprocess.run(['unzip', '-l', apk_path],
-                              capture_output=True, text=True, check=True)
-
-        # Look for flutter-related files
-        if 'flutter_assets' in result.stdout or 'libflutter.so' in result.stdout:
-            return True
-
-        return False
-    except subprocess.CalledProcessError:
-        # If unzip fails, we can't determine if it's Flutter
+        st = os.stat(apk_path)
+    except OSError:
         return False
+    return _detect_flutter_memo(apk_path, st.st_size, st.st_mtime_ns)
 
 def get_app_metadata(package_name):
     """
@@ -145,32 +285,43 @@ def get_app_metadata(package_name):
     }
 
     try:
-        # Get app label/name
-        result = subprocess.run([ADB_PATH, 'shell', 'dumpsys', 'package', package_name],
-                              capture_output=True, text=True, check=True)
-
-        # Parse the output to extract relevant information
-        lines = result.stdout.split('\n')
-        for line in lines:
-            if 'applicationLabel=' in line:
-                # Extract app name
-                metadata['app_name'] = line.split('applicationLabel=')[1].strip()
-            elif 'versionName=' in line:
-                # Extract version
-                metadata['version'] = line.split('versionName=')[1].strip()
+        # Stream the dumpsys output instead of buffering the whole
+        # multi-megabyte dump; both fields appear early, so the read
+        # stops as soon as they are captured
+        proc = subprocess.Popen([ADB_PATH, 'shell', 'dumpsys', 'package', package_name],
+                              stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                              text=True)
+        needed = {'applicationLabel=', 'versionName='}
+        fields = {'applicationLabel=': 'app_name', 'versionName=': 'version'}
+        try:
+            for line in proc.stdout:
+                for tag in needed:
+                    if tag in line:
+                        metadata[fields[tag]] = line.partition(tag)[2].strip()
+                        needed.discard(tag)
+                        break
+                if not needed:
+                    proc.terminate()
+                    break
+        finally:
+            proc.stdout.close()
+            proc.wait()
 
         # Try to get developer information (this is often not directly available)
-        # We can try to extract it from the APK path or other sources
+        # We can try to extract it from the APK path; after a package
+        # listing this is served from the cache without another adb call
         apk_path = get_apk_path(package_name)
         if apk_path:
             # The APK path might contain some developer information
-            # This is a simplified approach
-            path_parts = apk_path.split('/')
-            if len(path_parts) > 2:
+            # This is a simplified approach: take the penultimate path
+            # segment via rpartition, without splitting the whole path
+            head = apk_path.rpartition('/')[0]
+            developer = head.rpartition('/')[2]
+            if developer:
                 # Sometimes the developer info is in the path
-                metadata['developer'] = path_parts[-2]  # Just a guess
+                metadata['developer'] = developer  # Just a guess
 
-    except subprocess.CalledProcessError as e:
+    except (OSError, subprocess.SubprocessError) as e:
         print(f"Error getting metadata for {package_name}: {e}")
 
     return metadata
@@ -189,33 +340,29 @@ def group_apps_by_developer(packages):
 
     for package in packages:
         # Extract potential developer name from package name
-        # This is a heuristic approach - in reality, you'd need more sophisticated methods
-        parts = package.split('.')
-
-        # Common patterns for developer identification
-        if len(parts) >= 2:
-            # Try to identify developer from package name structure
-            # e.g., com.google.android.apps.photos -> google
-            # e.g., com.whatsapp -> whatsapp
-            # e.g., com.facebook.katana -> facebook
-
-            if parts[0] == 'com' and len(parts) >= 3:
-                if parts[1] in ['google', 'microsoft', 'facebook', 'twitter', 'instagram']:
-                    developer = parts[1]
-                else:
-                    developer = parts[1] + '.' + parts[2] if len(parts) > 2 else parts[1]
-            else:
-                developer = parts[0]
+        # This is a heuristic approach - in reality, you'd need more
+        # sophisticated methods. Partition peels off just the first two
+        # labels without allocating a full split list per package
+        # e.g., com.google.android.apps.photos -> google
+        # e.g., com.whatsapp -> whatsapp
+        # e.g., com.facebook.katana -> facebook
+        head, _, rest = package.partition('.')
+
+        if not rest:
+            # Fallback for unusual package names
+            developer_groups.setdefault('unknown', []).append(package)
+            continue
 
-            # Add to developer group
-            if developer not in developer_groups:
-                developer_groups[developer] = []
-            developer_groups[developer].append(package)
+        mid, _, tail = rest.partition('.')
+        if head == 'com' and tail:
+            if mid in _KNOWN_VENDORS:
+                developer = mid
+            else:
+                developer = f"{mid}.{tail.partition('.')[0]}"
         else:
-            # Fallback for unusual package names
-            if 'unknown' not in developer_groups:
-                developer_groups['unknown'] = []
-            developer_groups['unknown'].append(package)
+            developer = head
+
+        developer_groups.setdefault(developer, []).append(package)
 
     return developer_groups
 
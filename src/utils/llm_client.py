@@ -3,17 +3,73 @@
 LLM Client for Auto APK Analyzer
 """
 
+import asyncio
+import hashlib
 import json
 import os
+import sqlite3
+import threading
+import time
 import requests
-
-# Load API keys
-api_keys = {}
-try:
-    with open(os.path.join(os.path.dirname(__file__), '..', '..', 'api_keys.json')) as f:
-        api_keys = json.load(f)
-except FileNotFoundError:
-    print("Warning: api_keys.json not found")
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Connect / read timeouts for every provider call, so one stalled
+# service cannot hang a fan-out indefinitely
+REQUEST_TIMEOUT = (5, 60)
+
+# On-disk response cache so repeating a query does not re-bill and
+# re-wait on every provider
+_CACHE_DB_PATH = os.path.expanduser("~/.cache/autoapp/llm_cache.db")
+_cache_lock = threading.Lock()
+_cache_conn = None
+
+def _get_cache_conn():
+    """
+    Open (once) the SQLite response cache, or None if unavailable.
+
+    Returns:
+        sqlite3.Connection: Cache connection, or None
+    """
+    global _cache_conn
+    if _cache_conn is None:
+        try:
+            os.makedirs(os.path.dirname(_CACHE_DB_PATH), exist_ok=True)
+            conn = sqlite3.connect(_CACHE_DB_PATH, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS resp("
+                "key BLOB PRIMARY KEY, svc TEXT, model TEXT, ts INT, body TEXT)"
+            )
+            conn.commit()
+            _cache_conn = conn
+        except (OSError, sqlite3.Error) as e:
+            print(f"Warning: LLM response cache unavailable: {e}")
+            return None
+    return _cache_conn
+
+def _cache_key(service_name, model, prompt):
+    """
+    Build the fixed-size cache key for one (service, model, prompt).
+
+    Args:
+        service_name (str): LLM service name
+        model (str): Model identifier
+        prompt (str): Prompt text
+
+    Returns:
+        bytes: 16-byte digest
+    """
+    return hashlib.blake2b(
+        f"{service_name}|{model}|{prompt}".encode(), digest_size=16
+    ).digest()
+
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from config_cache import get_api_keys
+
+# Load API keys through the shared cache (one parse per process)
+api_keys = get_api_keys()
 
 class LLMClient:
     def __init__(self, service_name):
@@ -27,12 +83,33 @@ class LLMClient:
         self.api_key = api_keys.get(service_name, "")
         self.is_configured = bool(self.api_key)
 
-    def query(self, prompt, **kwargs):
+        # One session per client keeps the TLS connection to the
+        # provider alive between queries instead of paying a full
+        # handshake per request, and retries transient upstream errors
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504]
+            )
+        ))
+
+    def query(self, prompt, max_age=None, force_refresh=False, **kwargs):
         """
         Query the LLM service with a prompt.
 
+        Responses are cached on disk keyed by (service, model, prompt),
+        so repeating a query answers from SQLite instead of paying the
+        provider round-trip again.
+
         Args:
             prompt (str): The prompt to send to the LLM
+            max_age (int): Reject cached responses older than this many
+                seconds (None accepts any age)
+            force_refresh (bool): Skip the cache and re-query
             **kwargs: Additional arguments for the specific service
 
         Returns:
@@ -41,22 +118,139 @@ class LLMClient:
         if not self.is_configured:
             return f"Error: {self.service_name} API key not configured"
 
+        model = kwargs.get("model", "")
+        key = _cache_key(self.service_name, model, prompt)
+        conn = _get_cache_conn()
+        if conn and not force_refresh:
+            with _cache_lock:
+                row = conn.execute(
+                    "SELECT ts, body FROM resp WHERE key=?", (key,)
+                ).fetchone()
+            if row and (max_age is None or time.time() - row[0] <= max_age):
+                return row[1]
+
         try:
             if self.service_name == "perplexity":
-                return self._query_perplexity(prompt, **kwargs)
+                response = self._query_perplexity(prompt, **kwargs)
             elif self.service_name == "gemini":
-                return self._query_gemini(prompt, **kwargs)
+                response = self._query_gemini(prompt, **kwargs)
             elif self.service_name == "chatgpt":
-                return self._query_chatgpt(prompt, **kwargs)
+                response = self._query_chatgpt(prompt, **kwargs)
             elif self.service_name == "modelscope":
-                return self._query_modelscope(prompt, **kwargs)
+                response = self._query_modelscope(prompt, **kwargs)
             elif self.service_name == "openrouter":
-                return self._query_openrouter(prompt, **kwargs)
+                response = self._query_openrouter(prompt, **kwargs)
             else:
                 return f"Error: Unsupported service {self.service_name}"
         except Exception as e:
             return f"Error querying {self.service_name}: {e}"
 
+        if conn and not response.startswith(("HTTP ", "Error")):
+            with _cache_lock:
+                conn.execute(
+                    "INSERT OR REPLACE INTO resp VALUES (?, ?, ?, ?, ?)",
+                    (key, self.service_name, model, int(time.time()), response)
+                )
+                conn.commit()
+        return response
+
+    # Chat-completions endpoints that speak the OpenAI SSE protocol
+    _STREAM_ENDPOINTS = {
+        "perplexity": "https://api.perplexity.ai/chat/completions",
+        "chatgpt": "https://api.openai.com/v1/chat/completions",
+        "openrouter": "https://openrouter.ai/api/v1/chat/completions",
+    }
+
+    def query_stream(self, prompt, **kwargs):
+        """
+        Query the LLM service and yield response text incrementally.
+
+        For OpenAI-compatible providers this requests stream mode and
+        yields content deltas as the SSE frames arrive, so consumers
+        see the first tokens without waiting for the full body and
+        peak memory stays bounded by one frame. Services without a
+        streaming endpoint yield the complete query() response once.
+
+        Args:
+            prompt (str): The prompt to send to the LLM
+            **kwargs: Additional arguments for the specific service
+
+        Yields:
+            str: Chunks of response text
+        """
+        if not self.is_configured:
+            yield f"Error: {self.service_name} API key not configured"
+            return
+
+        url = self._STREAM_ENDPOINTS.get(self.service_name)
+        if url is None:
+            yield self.query(prompt, **kwargs)
+            return
+
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        data = {
+            "model": kwargs.get("model", "gpt-3.5-turbo" if self.service_name == "chatgpt"
+                                else "llama-3-sonar-large-32k-online" if self.service_name == "perplexity"
+                                else "openrouter/auto"),
+            "messages": [
+                {"role": "system", "content": "You are a mobile app security analyst. Help identify APIs and endpoints in mobile applications."},
+                {"role": "user", "content": prompt}
+            ],
+            "stream": True
+        }
+
+        try:
+            with self.session.post(url, headers=headers, data=json.dumps(data),
+                                   timeout=REQUEST_TIMEOUT, stream=True) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line or not line.startswith(b"data: "):
+                        continue
+                    payload = line[6:]
+                    if payload == b"[DONE]":
+                        break
+                    try:
+                        delta = json.loads(payload)["choices"][0].get("delta", {})
+                    except (json.JSONDecodeError, KeyError, IndexError):
+                        continue
+                    content = delta.get("content")
+                    if content:
+                        yield content
+        except Exception as e:
+            yield f"Error querying {self.service_name}: {e}"
+
+    def _post_and_extract(self, url, headers, data, path):
+        """
+        POST one provider request and walk the response to the text.
+
+        Shared by every provider method: one request, one JSON parse,
+        and a key walk down to the content. HTTP errors return a short
+        diagnostic string without parsing the body as JSON at all.
+
+        Args:
+            url (str): Endpoint URL
+            headers (dict): Request headers
+            data (dict): JSON-serializable request body
+            path (tuple): Keys/indices from the response root to the text
+
+        Returns:
+            str: Extracted response text, or an error string
+        """
+        response = self.session.post(url, headers=headers, data=json.dumps(data),
+                                     timeout=REQUEST_TIMEOUT)
+        if response.status_code >= 400:
+            return f"HTTP {response.status_code}: {response.text[:200]}"
+
+        # Parse the raw bytes directly; json.loads runs its C scanner
+        # over the buffer without requests' encoding detection pass
+        obj = json.loads(response.content)
+        for key in path:
+            obj = obj[key]
+        return obj
+
     def _query_perplexity(self, prompt, **kwargs):
         """Query Perplexity API."""
         # Perplexity API endpoint
@@ -75,11 +269,8 @@ class LLMClient:
             ]
         }
 
-        response = requests.post(url, headers=headers, json=data)
-        response.raise_for_status()
-
-        result = response.json()
-        return result["choices"][0]["message"]["content"]
+        return self._post_and_extract(url, headers, data,
+                                      ("choices", 0, "message", "content"))
 
     def _query_gemini(self, prompt, **kwargs):
         """Query Gemini API."""
@@ -99,11 +290,8 @@ class LLMClient:
             }]
         }
 
-        response = requests.post(url, headers=headers, json=data)
-        response.raise_for_status()
-
-        result = response.json()
-        return result["candidates"][0]["content"]["parts"][0]["text"]
+        return self._post_and_extract(url, headers, data,
+                                      ("candidates", 0, "content", "parts", 0, "text"))
 
     def _query_chatgpt(self, prompt, **kwargs):
         """Query ChatGPT API."""
@@ -123,11 +311,8 @@ class LLMClient:
             ]
         }
 
-        response = requests.post(url, headers=headers, json=data)
-        response.raise_for_status()
-
-        result = response.json()
-        return result["choices"][0]["message"]["content"]
+        return self._post_and_extract(url, headers, data,
+                                      ("choices", 0, "message", "content"))
 
     def _query_modelscope(self, prompt, **kwargs):
         """Query ModelScope API."""
@@ -154,11 +339,7 @@ class LLMClient:
             }
         }
 
-        response = requests.post(url, headers=headers, json=data)
-        response.raise_for_status()
-
-        result = response.json()
-        return result["output"]["text"]
+        return self._post_and_extract(url, headers, data, ("output", "text"))
 
     def _query_openrouter(self, prompt, **kwargs):
         """Query OpenRouter API."""
@@ -179,11 +360,42 @@ class LLMClient:
             ]
         }
 
-        response = requests.post(url, headers=headers, json=data)
-        response.raise_for_status()
+        return self._post_and_extract(url, headers, data,
+                                      ("choices", 0, "message", "content"))
+
+# Prompt templates built once at import; each call only formats the
+# variable part in
+_DISCOVERY_PROMPT_TMPL = """
+        Based on the following query, identify popular mobile applications that might be relevant:
+
+        Query: {}
+
+        Please provide:
+        1. A list of 5-10 relevant mobile applications
+        2. For each app, provide:
+           - Package name (for Android) or bundle ID (for iOS)
+           - Brief description of the app's functionality
+           - Likely API endpoints the app might use
+           - Potential security considerations
+
+        Format your response as a structured list.
+        """
+
+_ANALYSIS_PROMPT_TMPL = """
+        Based on the following app information, analyze what APIs and endpoints this app might use:
+
+        App Information: {}
+
+        Please provide:
+        1. Likely API endpoints (URLs) the app might communicate with
+        2. Common HTTP methods used (GET, POST, PUT, DELETE, etc.)
+        3. Expected request/response formats
+        4. Authentication mechanisms that might be used
+        5. Potential hidden or undocumented endpoints
+        6. Security considerations for these APIs
 
-        result = response.json()
-        return result["choices"][0]["message"]["content"]
+        Format your response as a structured analysis.
+        """
 
 class AppDiscoveryClient:
     def __init__(self):
@@ -196,42 +408,81 @@ class AppDiscoveryClient:
             "openrouter": LLMClient("openrouter")
         }
 
-    def discover_apps(self, query):
+    def _query_all(self, prompt, purpose):
         """
-        Discover mobile apps using LLM services.
+        Send one prompt to every configured service concurrently.
+
+        The providers are independent HTTPS endpoints, so dispatching
+        them from a thread pool makes the fan-out cost the slowest
+        response instead of the sum of all of them.
 
         Args:
-            query (str): Query about mobile apps to discover
+            prompt (str): Prompt to send
+            purpose (str): Short label for progress output
 
         Returns:
-            dict: Results from different LLM services
+            dict: Response (or configuration error) per service
         """
-        results = {}
+        results = {service_name: f"API key not configured for {service_name}"
+                   for service_name, client in self.clients.items()
+                   if not client.is_configured}
+        configured = {service_name: client
+                      for service_name, client in self.clients.items()
+                      if client.is_configured}
+        if not configured:
+            return results
+
+        with ThreadPoolExecutor(max_workers=len(configured)) as executor:
+            futures = {executor.submit(client.query, prompt): service_name
+                       for service_name, client in configured.items()}
+            for service_name in configured:
+                print(f"Querying {service_name} for {purpose}...")
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
 
-        discovery_prompt = f"""
-        Based on the following query, identify popular mobile applications that might be relevant:
+        return results
 
-        Query: {query}
+    async def query_all_async(self, prompt):
+        """
+        Async variant of the provider fan-out.
 
-        Please provide:
-        1. A list of 5-10 relevant mobile applications
-        2. For each app, provide:
-           - Package name (for Android) or bundle ID (for iOS)
-           - Brief description of the app's functionality
-           - Likely API endpoints the app might use
-           - Potential security considerations
+        Each configured client's query runs in a worker thread via
+        asyncio.to_thread and the results are gathered, so callers that
+        already live inside an event loop can overlap this fan-out with
+        other coroutines (for example running discovery and analysis
+        concurrently) and apply asyncio timeouts or cancellation.
 
-        Format your response as a structured list.
+        Args:
+            prompt (str): Prompt to send
+
+        Returns:
+            dict: Response (or configuration error) per service
+        """
+        results = {service_name: f"API key not configured for {service_name}"
+                   for service_name, client in self.clients.items()
+                   if not client.is_configured}
+        configured = {service_name: client
+                      for service_name, client in self.clients.items()
+                      if client.is_configured}
+        if configured:
+            responses = await asyncio.gather(
+                *(asyncio.to_thread(client.query, prompt)
+                  for client in configured.values())
+            )
+            results.update(zip(configured.keys(), responses))
+        return results
+
+    def discover_apps(self, query):
         """
+        Discover mobile apps using LLM services.
 
-        for service_name, client in self.clients.items():
-            if client.is_configured:
-                print(f"Querying {service_name} for app discovery...")
-                results[service_name] = client.query(discovery_prompt)
-            else:
-                results[service_name] = f"API key not configured for {service_name}"
+        Args:
+            query (str): Query about mobile apps to discover
 
-        return results
+        Returns:
+            dict: Results from different LLM services
+        """
+        return self._query_all(_DISCOVERY_PROMPT_TMPL.format(query), "app discovery")
 
     def analyze_app_apis(self, app_info):
         """
@@ -243,32 +494,7 @@ class AppDiscoveryClient:
         Returns:
             dict: Analysis results from different LLM services
         """
-        results = {}
-
-        analysis_prompt = f"""
-        Based on the following app information, analyze what APIs and endpoints this app might use:
-
-        App Information: {app_info}
-
-        Please provide:
-        1. Likely API endpoints (URLs) the app might communicate with
-        2. Common HTTP methods used (GET, POST, PUT, DELETE, etc.)
-        3. Expected request/response formats
-        4. Authentication mechanisms that might be used
-        5. Potential hidden or undocumented endpoints
-        6. Security considerations for these APIs
-
-        Format your response as a structured analysis.
-        """
-
-        for service_name, client in self.clients.items():
-            if client.is_configured:
-                print(f"Querying {service_name} for API analysis...")
-                results[service_name] = client.query(analysis_prompt)
-            else:
-                results[service_name] = f"API key not configured for {service_name}"
-
-        return results
+        return self._query_all(_ANALYSIS_PROMPT_TMPL.format(app_info), "API analysis")
 
 # Example usage
 if __name__ == "__main__":
@@ -3,18 +3,19 @@
 MCP Client for Auto APK Analyzer
 """
 
-import json
+import select
 import subprocess
 import os
+import threading
 import time
+from collections import deque
 
-# Load configuration
-config = {}
-try:
-    with open(os.path.join(os.path.dirname(__file__), '..', '..', 'config.json')) as f:
-        config = json.load(f)
-except FileNotFoundError:
-    print("Warning: config.json not found")
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from config_cache import get_config
+
+# Load configuration through the shared cache (one parse per process)
+config = get_config()
 
 class MCPClient:
     def __init__(self, server_name):
@@ -27,11 +28,48 @@ class MCPClient:
         self.server_name = server_name
         self.server_config = config.get('mcp_servers', {}).get(server_name, {})
         self.process = None
+        # Ring buffers keep the most recent server output without ever
+        # letting a full pipe buffer block the child
+        self._stdout_ring = deque(maxlen=1000)
+        self._stderr_ring = deque(maxlen=1000)
+        self._drain_threads = []
+
+    def _drain(self, stream, ring):
+        """
+        Consume a child stream into its ring buffer until EOF.
+
+        Args:
+            stream (io.TextIOBase): Child stdout or stderr
+            ring (collections.deque): Destination ring buffer
+        """
+        for line in stream:
+            ring.append(line)
+
+    def _start_drain(self, stream, ring):
+        """
+        Launch a daemon thread draining one child stream.
+
+        Args:
+            stream (io.TextIOBase): Child stdout or stderr
+            ring (collections.deque): Destination ring buffer
+        """
+        thread = threading.Thread(target=self._drain, args=(stream, ring), daemon=True)
+        thread.start()
+        self._drain_threads.append(thread)
 
-    def start_server(self):
+    def start_server(self, timeout=10):
         """
         Start the MCP server process.
 
+        Polls for readiness with a backed-off wait instead of a fixed
+        sleep, so fast servers are usable within tens of milliseconds
+        and slow ones get the full timeout. If the server config names
+        a ready_marker string, stdout is watched for it; otherwise the
+        server counts as ready once it survives the probe loop.
+
+        Args:
+            timeout (int): Maximum seconds to wait for readiness
+
         Returns:
             bool: True if server started successfully, False otherwise
         """
@@ -42,6 +80,7 @@ class MCPClient:
         try:
             command = self.server_config['command']
             args = self.server_config.get('args', [])
+            ready_marker = self.server_config.get('ready_marker')
 
             # Start the server process
             self.process = subprocess.Popen([command] + args,
@@ -49,22 +88,65 @@ class MCPClient:
                                           stderr=subprocess.PIPE,
                                           text=True)
 
-            # Give the server a moment to start
-            time.sleep(2)
+            # Drain stderr from the start so a chatty server can never
+            # wedge on a full pipe while looking alive to poll(); the
+            # stdout drain starts once the readiness probe is done with
+            # the stream
+            self._start_drain(self.process.stderr, self._stderr_ring)
+            if not ready_marker:
+                self._start_drain(self.process.stdout, self._stdout_ring)
+
+            deadline = time.monotonic() + timeout
+            delay = 0.01
+            while time.monotonic() < deadline:
+                if self.process.poll() is not None:
+                    print(f"Error starting MCP server '{self.server_name}': "
+                          f"{self._last_stderr()}")
+                    return False
+
+                if ready_marker:
+                    readable, _, _ = select.select([self.process.stdout], [], [], 0.05)
+                    if readable:
+                        line = self.process.stdout.readline()
+                        self._stdout_ring.append(line)
+                        if ready_marker in line:
+                            self._start_drain(self.process.stdout, self._stdout_ring)
+                            print(f"MCP server '{self.server_name}' started successfully")
+                            return True
+                else:
+                    time.sleep(delay)
+                    delay = min(delay * 2, 0.2)
+                    # No marker to wait for: surviving the first probe
+                    # windows is the best readiness signal available
+                    if delay >= 0.2:
+                        print(f"MCP server '{self.server_name}' started successfully")
+                        return True
 
-            # Check if the process is still running
             if self.process.poll() is None:
+                if ready_marker:
+                    self._start_drain(self.process.stdout, self._stdout_ring)
                 print(f"MCP server '{self.server_name}' started successfully")
                 return True
-            else:
-                stdout, stderr = self.process.communicate()
-                print(f"Error starting MCP server '{self.server_name}': {stderr}")
-                return False
+            print(f"Error starting MCP server '{self.server_name}': "
+                  f"{self._last_stderr()}")
+            return False
 
         except Exception as e:
             print(f"Error starting MCP server '{self.server_name}': {e}")
             return False
 
+    def _last_stderr(self):
+        """
+        Return the drained stderr output collected so far.
+
+        Returns:
+            str: Joined tail of the server's stderr
+        """
+        # Give the drain thread a moment to flush what the child wrote
+        # before exiting
+        time.sleep(0.05)
+        return ''.join(self._stderr_ring).strip()
+
     def stop_server(self):
         """
         Stop the MCP server process.
@@ -77,6 +159,9 @@ class MCPClient:
             except subprocess.TimeoutExpired:
                 self.process.kill()
                 print(f"MCP server '{self.server_name}' killed forcefully")
+        for thread in self._drain_threads:
+            thread.join(timeout=1)
+        self._drain_threads.clear()
 
     def is_running(self):
         """
@@ -3,7 +3,9 @@
 Predefined Flows, Tasks, and Subtasks for Auto APK Analyzer
 """
 
-from typing import List, Dict
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Mapping, Tuple
 from .task_manager import TaskPriority
 
 # Predefined flows for APK analysis
@@ -312,17 +314,30 @@ PREDEFINED_SUBTASKS = {
     ]
 }
 
+# Freeze the task tables: read-only views over tuples mean consumers
+# can share them directly (including across forked workers) and no
+# defensive copies are needed
+PREDEFINED_TASKS = {
+    flow_id: tuple(MappingProxyType(task) for task in tasks)
+    for flow_id, tasks in PREDEFINED_TASKS.items()
+}
+PREDEFINED_SUBTASKS = {
+    task_id: tuple(MappingProxyType(subtask) for subtask in subtasks)
+    for task_id, subtasks in PREDEFINED_SUBTASKS.items()
+}
+
+# Index built once at import so flow lookups are one dict probe
+# instead of a scan over PREDEFINED_FLOWS
+_FLOW_INDEX: Dict[str, Dict] = {flow["flow_id"]: flow for flow in PREDEFINED_FLOWS}
+
 def get_flow_definition(flow_id: str) -> Dict:
     """Get the definition for a specific flow."""
-    for flow in PREDEFINED_FLOWS:
-        if flow["flow_id"] == flow_id:
-            return flow
-    return None
+    return _FLOW_INDEX.get(flow_id)
 
-def get_tasks_for_flow(flow_id: str) -> List[Dict]:
+def get_tasks_for_flow(flow_id: str) -> Tuple[Mapping, ...]:
     """Get predefined tasks for a specific flow."""
-    return PREDEFINED_TASKS.get(flow_id, [])
+    return PREDEFINED_TASKS.get(flow_id, ())
 
-def get_subtasks_for_task(task_id: str) -> List[Dict]:
+def get_subtasks_for_task(task_id: str) -> Tuple[Mapping, ...]:
     """Get predefined subtasks for a specific task."""
-    return PREDEFINED_SUBTASKS.get(task_id, [])
\ No newline at end of file
+    return PREDEFINED_SUBTASKS.get(task_id, ())
\ No newline at end of file
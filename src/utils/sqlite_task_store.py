@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+SQLite-backed task storage for Auto APK Analyzer
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from typing import List, Optional
+
+from .task_manager import Flow, Task, TaskStatus
+
+class SQLiteTaskStore:
+    """
+    Row-per-task persistence for workspaces that outgrow the JSON
+    snapshots.
+
+    Where the snapshot files rewrite every task on compaction and parse
+    the whole blob on load, this store updates one row per mutation,
+    fetches tasks on demand, and answers status-filtered listings from
+    an index instead of a full scan. The connection runs in WAL mode
+    with synchronous=NORMAL, so writes are one journaled row each
+    rather than a file rewrite.
+    """
+
+    _SCHEMA = """
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=NORMAL;
+        CREATE TABLE IF NOT EXISTS tasks(
+            task_id TEXT PRIMARY KEY,
+            data TEXT NOT NULL,
+            status TEXT NOT NULL,
+            parent_task_id TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
+        CREATE INDEX IF NOT EXISTS idx_tasks_parent ON tasks(parent_task_id);
+        CREATE TABLE IF NOT EXISTS flows(
+            flow_id TEXT PRIMARY KEY,
+            data TEXT NOT NULL,
+            status TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, workspace_path: str = "./workspace"):
+        os.makedirs(workspace_path, exist_ok=True)
+        self.db_path = os.path.join(workspace_path, "workspace.db")
+        # Autocommit plus WAL keeps each mutation a single journaled
+        # write; the lock serializes cursor use across caller threads
+        self._conn = sqlite3.connect(self.db_path, isolation_level=None,
+                                     check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.executescript(self._SCHEMA)
+
+    def save_task(self, task: Task):
+        """Insert or update one task row."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tasks(task_id, data, status, parent_task_id) "
+                "VALUES (?, ?, ?, ?)",
+                (task.task_id, json.dumps(task.to_dict(), separators=(',', ':')),
+                 task.status.value, task.parent_task_id))
+
+    def get_task(self, task_id: str) -> Optional[Task]:
+        """Fetch one task by id, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM tasks WHERE task_id=?", (task_id,)).fetchone()
+        return Task.from_dict(json.loads(row[0])) if row else None
+
+    def list_tasks(self, status: Optional[TaskStatus] = None) -> List[Task]:
+        """List tasks, optionally filtered by status via the index."""
+        with self._lock:
+            if status:
+                rows = self._conn.execute(
+                    "SELECT data FROM tasks WHERE status=?", (status.value,)).fetchall()
+            else:
+                rows = self._conn.execute("SELECT data FROM tasks").fetchall()
+        return [Task.from_dict(json.loads(row[0])) for row in rows]
+
+    def list_subtasks(self, parent_task_id: str) -> List[Task]:
+        """List the direct subtasks of one parent via the index."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM tasks WHERE parent_task_id=?",
+                (parent_task_id,)).fetchall()
+        return [Task.from_dict(json.loads(row[0])) for row in rows]
+
+    def save_flow(self, flow: Flow):
+        """Insert or update one flow row."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO flows(flow_id, data, status) VALUES (?, ?, ?)",
+                (flow.flow_id, json.dumps(flow.to_dict(), separators=(',', ':')),
+                 flow.status.value))
+
+    def get_flow(self, flow_id: str) -> Optional[Flow]:
+        """Fetch one flow by id, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM flows WHERE flow_id=?", (flow_id,)).fetchone()
+        return Flow.from_dict(json.loads(row[0])) if row else None
+
+    def list_flows(self, status: Optional[TaskStatus] = None) -> List[Flow]:
+        """List flows, optionally filtered by status."""
+        with self._lock:
+            if status:
+                rows = self._conn.execute(
+                    "SELECT data FROM flows WHERE status=?", (status.value,)).fetchall()
+            else:
+                rows = self._conn.execute("SELECT data FROM flows").fetchall()
+        return [Flow.from_dict(json.loads(row[0])) for row in rows]
+
+    def import_manager(self, manager):
+        """Copy every task and flow from a TaskManager into the store."""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for task in manager.tasks.values():
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO tasks(task_id, data, status, parent_task_id) "
+                        "VALUES (?, ?, ?, ?)",
+                        (task.task_id, json.dumps(task.to_dict(), separators=(',', ':')),
+                         task.status.value, task.parent_task_id))
+                for flow in manager.flows.values():
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO flows(flow_id, data, status) VALUES (?, ?, ?)",
+                        (flow.flow_id, json.dumps(flow.to_dict(), separators=(',', ':')),
+                         flow.status.value))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def close(self):
+        """Close the underlying connection."""
+        with self._lock:
+            self._conn.close()
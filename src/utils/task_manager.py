@@ -3,11 +3,20 @@
 Task Manager for Auto APK Analyzer
 """
 
+import atexit
+import heapq
+import itertools
 import json
+import time
 import os
+import queue
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 from enum import Enum
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set, Tuple
 
 class TaskStatus(Enum):
     PENDING = "pending"
@@ -21,43 +30,108 @@ class TaskPriority(Enum):
     HIGH = 3
     CRITICAL = 4
 
+def _ts_ns(value) -> Optional[int]:
+    """
+    Coerce a serialized timestamp to integer nanoseconds.
+
+    Accepts the current integer form and the ISO strings written by
+    older snapshots and WAL files.
+
+    Args:
+        value: int nanoseconds, ISO-8601 str, or None
+
+    Returns:
+        Optional[int]: Nanosecond timestamp, or None
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return int(datetime.fromisoformat(value).timestamp() * 1_000_000_000)
+    return int(value)
+
+# Display glyph per task status, built once for the print helpers
+_STATUS_ICON = {
+    TaskStatus.PENDING: "○",
+    TaskStatus.IN_PROGRESS: "◐",
+    TaskStatus.COMPLETED: "✓",
+    TaskStatus.FAILED: "✗"
+}
+
 class Task:
+    # Slots drop the per-instance __dict__: thousands of loaded tasks
+    # cost a few hundred bytes less each and attribute reads resolve
+    # at a fixed offset
+    __slots__ = ("task_id", "name", "description", "status", "priority",
+                 "parent_task_id", "subtasks", "pending_subtasks",
+                 "created_at_ns", "started_at_ns", "completed_at_ns",
+                 "assigned_to", "metadata")
+
     def __init__(self, task_id: str, name: str, description: str,
                  priority: TaskPriority = TaskPriority.MEDIUM,
                  parent_task_id: Optional[str] = None):
-        self.task_id = task_id
+        # Task ids recur as dict keys, subtask entries, and parent
+        # references; interning makes those hash lookups compare by
+        # pointer identity
+        self.task_id = sys.intern(task_id)
         self.name = name
         self.description = description
         self.status = TaskStatus.PENDING
         self.priority = priority
-        self.parent_task_id = parent_task_id
+        self.parent_task_id = sys.intern(parent_task_id) if parent_task_id else parent_task_id
         self.subtasks: List[str] = []
-        self.created_at = datetime.now()
-        self.started_at: Optional[datetime] = None
-        self.completed_at: Optional[datetime] = None
+        # Count of subtasks not yet completed; lets the manager decide
+        # parent completion without rescanning every sibling
+        self.pending_subtasks: int = 0
+        # Plain integer nanoseconds: one clock read per transition with
+        # no datetime allocation; the properties below render datetimes
+        # on demand for display
+        self.created_at_ns: int = time.time_ns()
+        self.started_at_ns: Optional[int] = None
+        self.completed_at_ns: Optional[int] = None
         self.assigned_to: Optional[str] = None
         self.metadata: Dict[str, Any] = {}
 
+    @property
+    def created_at(self) -> datetime:
+        """Creation time as a datetime, for display."""
+        return datetime.fromtimestamp(self.created_at_ns / 1e9)
+
+    @property
+    def started_at(self) -> Optional[datetime]:
+        """Start time as a datetime, or None."""
+        if self.started_at_ns is None:
+            return None
+        return datetime.fromtimestamp(self.started_at_ns / 1e9)
+
+    @property
+    def completed_at(self) -> Optional[datetime]:
+        """Completion time as a datetime, or None."""
+        if self.completed_at_ns is None:
+            return None
+        return datetime.fromtimestamp(self.completed_at_ns / 1e9)
+
     def start(self):
         """Mark task as in progress."""
         self.status = TaskStatus.IN_PROGRESS
-        self.started_at = datetime.now()
+        self.started_at_ns = time.time_ns()
 
     def complete(self):
         """Mark task as completed."""
         self.status = TaskStatus.COMPLETED
-        self.completed_at = datetime.now()
+        self.completed_at_ns = time.time_ns()
 
     def fail(self, error_message: str = ""):
         """Mark task as failed."""
         self.status = TaskStatus.FAILED
-        self.completed_at = datetime.now()
+        self.completed_at_ns = time.time_ns()
         self.metadata["error"] = error_message
 
     def add_subtask(self, subtask_id: str):
         """Add a subtask to this task."""
+        subtask_id = sys.intern(subtask_id)
         if subtask_id not in self.subtasks:
             self.subtasks.append(subtask_id)
+            self.pending_subtasks += 1
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert task to dictionary for serialization."""
@@ -69,9 +143,10 @@ class Task:
             "priority": self.priority.value,
             "parent_task_id": self.parent_task_id,
             "subtasks": self.subtasks,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "started_at": self.started_at.isoformat() if self.started_at else None,
-            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "pending_subtasks": self.pending_subtasks,
+            "created_at": self.created_at_ns,
+            "started_at": self.started_at_ns,
+            "completed_at": self.completed_at_ns,
             "assigned_to": self.assigned_to,
             "metadata": self.metadata
         }
@@ -87,45 +162,68 @@ class Task:
             parent_task_id=data.get("parent_task_id")
         )
         task.status = TaskStatus(data.get("status", "pending"))
-        task.subtasks = data.get("subtasks", [])
+        task.subtasks = [sys.intern(subtask_id) for subtask_id in data.get("subtasks", [])]
+        task.pending_subtasks = data.get("pending_subtasks", len(task.subtasks))
         task.assigned_to = data.get("assigned_to")
         task.metadata = data.get("metadata", {})
 
-        # Parse datetime fields
+        # Timestamps: integer nanoseconds, with ISO strings from older
+        # files converted on the way in
         if data.get("created_at"):
-            task.created_at = datetime.fromisoformat(data["created_at"])
-        if data.get("started_at"):
-            task.started_at = datetime.fromisoformat(data["started_at"])
-        if data.get("completed_at"):
-            task.completed_at = datetime.fromisoformat(data["completed_at"])
+            task.created_at_ns = _ts_ns(data["created_at"])
+        task.started_at_ns = _ts_ns(data.get("started_at"))
+        task.completed_at_ns = _ts_ns(data.get("completed_at"))
 
         return task
 
 class Flow:
+    __slots__ = ("flow_id", "name", "description", "tasks", "created_at_ns",
+                 "started_at_ns", "completed_at_ns", "status")
+
     def __init__(self, flow_id: str, name: str, description: str):
-        self.flow_id = flow_id
+        self.flow_id = sys.intern(flow_id)
         self.name = name
         self.description = description
         self.tasks: List[str] = []
-        self.created_at = datetime.now()
-        self.started_at: Optional[datetime] = None
-        self.completed_at: Optional[datetime] = None
+        self.created_at_ns: int = time.time_ns()
+        self.started_at_ns: Optional[int] = None
+        self.completed_at_ns: Optional[int] = None
         self.status = TaskStatus.PENDING
 
     def add_task(self, task_id: str):
         """Add a task to this flow."""
+        task_id = sys.intern(task_id)
         if task_id not in self.tasks:
             self.tasks.append(task_id)
 
+    @property
+    def created_at(self) -> datetime:
+        """Creation time as a datetime, for display."""
+        return datetime.fromtimestamp(self.created_at_ns / 1e9)
+
+    @property
+    def started_at(self) -> Optional[datetime]:
+        """Start time as a datetime, or None."""
+        if self.started_at_ns is None:
+            return None
+        return datetime.fromtimestamp(self.started_at_ns / 1e9)
+
+    @property
+    def completed_at(self) -> Optional[datetime]:
+        """Completion time as a datetime, or None."""
+        if self.completed_at_ns is None:
+            return None
+        return datetime.fromtimestamp(self.completed_at_ns / 1e9)
+
     def start(self):
         """Mark flow as in progress."""
         self.status = TaskStatus.IN_PROGRESS
-        self.started_at = datetime.now()
+        self.started_at_ns = time.time_ns()
 
     def complete(self):
         """Mark flow as completed."""
         self.status = TaskStatus.COMPLETED
-        self.completed_at = datetime.now()
+        self.completed_at_ns = time.time_ns()
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert flow to dictionary for serialization."""
@@ -135,9 +233,9 @@ class Flow:
             "description": self.description,
             "tasks": self.tasks,
             "status": self.status.value,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "started_at": self.started_at.isoformat() if self.started_at else None,
-            "completed_at": self.completed_at.isoformat() if self.completed_at else None
+            "created_at": self.created_at_ns,
+            "started_at": self.started_at_ns,
+            "completed_at": self.completed_at_ns
         }
 
     @classmethod
@@ -148,28 +246,256 @@ class Flow:
             name=data["name"],
             description=data["description"]
         )
-        flow.tasks = data.get("tasks", [])
+        flow.tasks = [sys.intern(task_id) for task_id in data.get("tasks", [])]
         flow.status = TaskStatus(data.get("status", "pending"))
 
-        # Parse datetime fields
+        # Timestamps: integer nanoseconds, with ISO strings from older
+        # files converted on the way in
         if data.get("created_at"):
-            flow.created_at = datetime.fromisoformat(data["created_at"])
-        if data.get("started_at"):
-            flow.started_at = datetime.fromisoformat(data["started_at"])
-        if data.get("completed_at"):
-            flow.completed_at = datetime.fromisoformat(data["completed_at"])
+            flow.created_at_ns = _ts_ns(data["created_at"])
+        flow.started_at_ns = _ts_ns(data.get("started_at"))
+        flow.completed_at_ns = _ts_ns(data.get("completed_at"))
 
         return flow
 
 class TaskManager:
+    # Compact the write-ahead log back into the snapshots after this
+    # many logged mutations
+    COMPACT_EVERY = 256
+
     def __init__(self, workspace_path: str = "./workspace"):
         self.workspace_path = workspace_path
         self.tasks_file = os.path.join(workspace_path, "tasks.json")
         self.flows_file = os.path.join(workspace_path, "flows.json")
+        self.wal_file = os.path.join(workspace_path, "tasks.wal")
+        self._wal = None
+        self._wal_count = 0
+        self._batch_buffer = None
+        # Mutations enqueue their WAL lines and return immediately; a
+        # single daemon thread drains the queue, coalescing whatever has
+        # accumulated into one write and flush. Call flush() before
+        # reading the files back, and close() on shutdown.
+        self._io_lock = threading.Lock()
+        # Two workers so the independent tasks.json and flows.json
+        # writes overlap during compaction
+        self._io_pool = ThreadPoolExecutor(max_workers=2)
+        self._save_queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer_thread.start()
+        self._closed = False
+        # The writer is a daemon thread, so drain it at interpreter
+        # exit too - records queued by a caller that never reaches
+        # close() must still make the log
+        atexit.register(self.close)
         self.tasks: Dict[str, Task] = {}
         self.flows: Dict[str, Flow] = {}
+        # Status-keyed id sets so filtered listings cost O(matches)
+        # instead of a scan over every task
+        self._by_status: Dict[TaskStatus, Set[str]] = {s: set() for s in TaskStatus}
+        # Pending tasks ordered by priority (then creation order) so a
+        # dispatcher pops its next task in O(log N) instead of scanning
+        # the table; entries are lazily invalidated on pop
+        self._ready_heap: List[Tuple[int, int, str]] = []
+        self._seq = itertools.count()
         self.load_tasks()
         self.load_flows()
+        self._replay_wal()
+        self._rebuild_status_index()
+
+    def _rebuild_status_index(self):
+        """Recompute the status index and pending counters after a load."""
+        for id_set in self._by_status.values():
+            id_set.clear()
+        for task_id, task in self.tasks.items():
+            self._by_status[task.status].add(task_id)
+            if task.status == TaskStatus.PENDING:
+                self._push_ready(task)
+        # Derive the counters from actual subtask statuses so snapshots
+        # written before the counter existed (or stale WAL interleavings)
+        # never leave a parent waiting forever
+        for task in self.tasks.values():
+            task.pending_subtasks = sum(
+                1 for subtask_id in task.subtasks
+                if subtask_id in self.tasks
+                and self.tasks[subtask_id].status != TaskStatus.COMPLETED
+            )
+
+    def _push_ready(self, task: Task):
+        """Enqueue a pending task for priority-ordered dispatch."""
+        heapq.heappush(self._ready_heap,
+                       (-task.priority.value, next(self._seq), task.task_id))
+
+    def pop_ready(self) -> Optional[Task]:
+        """
+        Pop the highest-priority pending task, or None.
+
+        Entries whose task has since started, completed, failed, or
+        disappeared are skipped on the way out (lazy deletion), so no
+        bookkeeping is needed when statuses change.
+        """
+        while self._ready_heap:
+            _, _, task_id = heapq.heappop(self._ready_heap)
+            task = self.tasks.get(task_id)
+            if task is not None and task.status == TaskStatus.PENDING:
+                return task
+        return None
+
+    def _set_status(self, task_id: str, old_status: TaskStatus):
+        """Move one task between status index sets after a mutation."""
+        task = self.tasks[task_id]
+        if task.status != old_status:
+            self._by_status[old_status].discard(task_id)
+            self._by_status[task.status].add(task_id)
+
+    def _append_wal(self, record: Dict[str, Any]):
+        """
+        Append one mutation record to the write-ahead log.
+
+        Each task or flow mutation costs one small appended line instead
+        of re-serializing every task to the snapshot file; the snapshot
+        is rebuilt on compaction.
+        """
+        line = json.dumps(record, separators=(',', ':')) + "\n"
+        if self._batch_buffer is not None:
+            self._batch_buffer.append(line)
+            return
+        self._save_queue.put(line)
+
+    @contextmanager
+    def batch(self):
+        """
+        Coalesce the WAL writes of several mutations into one flush.
+
+        Inside the block, mutation records collect in memory; on exit
+        they hit the log in a single write and flush, so a burst of
+        related mutations (a flow with its tasks and subtasks) costs
+        one disk flush instead of one per call.
+        """
+        if self._batch_buffer is not None:
+            # Already batching; nested blocks flush at the outermost exit
+            yield self
+            return
+        self._batch_buffer = []
+        try:
+            yield self
+        finally:
+            lines = self._batch_buffer
+            self._batch_buffer = None
+            if lines:
+                self._save_queue.put(''.join(lines))
+
+    def _writer_loop(self):
+        """
+        Drain queued WAL records from the background writer thread.
+
+        Blocks for the first pending record, then sweeps everything
+        else already queued, so a burst of mutations lands in one
+        write and flush instead of one disk touch per mutation.
+        """
+        stopping = False
+        while not stopping:
+            chunks = [self._save_queue.get()]
+            got = 1
+            while True:
+                try:
+                    chunks.append(self._save_queue.get_nowait())
+                    got += 1
+                except queue.Empty:
+                    break
+            if None in chunks:
+                stopping = True
+                chunks = [chunk for chunk in chunks if chunk is not None]
+            data = ''.join(chunks)
+            if data:
+                try:
+                    with self._io_lock:
+                        if self._wal is None:
+                            os.makedirs(self.workspace_path, exist_ok=True)
+                            self._wal = open(self.wal_file, 'a')
+                        self._wal.write(data)
+                        self._wal.flush()
+                        self._wal_count += data.count("\n")
+                    if self._wal_count >= self.COMPACT_EVERY:
+                        self._compact()
+                except Exception as e:
+                    print(f"Error writing task WAL: {e}")
+            for _ in range(got):
+                self._save_queue.task_done()
+
+    def flush(self):
+        """Block until every queued mutation has reached the log."""
+        self._save_queue.join()
+
+    def close(self):
+        """Drain pending records, stop the writer, and close the log.
+
+        Safe to call more than once; the atexit hook makes the second
+        call a no-op after an explicit close().
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._save_queue.put(None)
+        self._writer_thread.join()
+        with self._io_lock:
+            if self._wal is not None:
+                self._wal.close()
+                self._wal = None
+        self._io_pool.shutdown(wait=True)
+
+    def _log_task(self, task: Task):
+        """Log the current state of one task to the WAL."""
+        self._append_wal({"op": "task", "data": task.to_dict()})
+
+    def _log_flow(self, flow: Flow):
+        """Log the current state of one flow to the WAL."""
+        self._append_wal({"op": "flow", "data": flow.to_dict()})
+
+    def _replay_wal(self):
+        """Apply WAL records on top of the loaded snapshots."""
+        if not os.path.exists(self.wal_file):
+            return
+        try:
+            with open(self.wal_file, 'r') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    record = json.loads(line)
+                    if record["op"] == "task":
+                        task = Task.from_dict(record["data"])
+                        self.tasks[task.task_id] = task
+                    elif record["op"] == "flow":
+                        flow = Flow.from_dict(record["data"])
+                        self.flows[flow.flow_id] = flow
+        except Exception as e:
+            print(f"Error replaying task WAL: {e}")
+
+    def compact(self):
+        """
+        Rewrite both snapshots and truncate the write-ahead log.
+
+        Called automatically every COMPACT_EVERY mutations; call it
+        explicitly on shutdown to leave a clean snapshot behind.
+        """
+        self.flush()
+        self._compact()
+
+    def _compact(self):
+        """Snapshot and truncate without draining the queue first."""
+        with self._io_lock:
+            # The snapshots touch different files; writing them from
+            # the pool lets their write/rename syscalls overlap
+            futures = [self._io_pool.submit(self.save_tasks),
+                       self._io_pool.submit(self.save_flows)]
+            for future in futures:
+                future.result()
+            if self._wal is not None:
+                self._wal.close()
+                self._wal = None
+            if os.path.exists(self.wal_file):
+                os.remove(self.wal_file)
+            self._wal_count = 0
 
     def create_task(self, task_id: str, name: str, description: str,
                    priority: TaskPriority = TaskPriority.MEDIUM,
@@ -177,64 +503,119 @@ class TaskManager:
         """Create a new task."""
         task = Task(task_id, name, description, priority, parent_task_id)
         self.tasks[task_id] = task
+        self._by_status[task.status].add(task_id)
+        self._push_ready(task)
 
         # If this is a subtask, add it to the parent
         if parent_task_id and parent_task_id in self.tasks:
             self.tasks[parent_task_id].add_subtask(task_id)
+            self._log_task(self.tasks[parent_task_id])
 
-        self.save_tasks()
+        self._log_task(task)
         return task
 
+    def register_bulk(self, specs, flow_id: Optional[str] = None) -> List[Task]:
+        """
+        Create several tasks with one coalesced persistence write.
+
+        Specs take the predefined-table shape (task_id, name,
+        description, optional priority and parent_task_id); parents
+        must precede their subtasks in the iterable. Top-level tasks
+        are linked into flow_id when given. The whole batch lands in
+        the log as a single write instead of one per task.
+
+        Args:
+            specs: Iterable of task spec mappings
+            flow_id (str): Flow to link top-level tasks into, or None
+
+        Returns:
+            list: The created Task objects, in input order
+        """
+        created = []
+        with self.batch():
+            for spec in specs:
+                task = self.create_task(
+                    spec["task_id"], spec["name"], spec["description"],
+                    spec.get("priority", TaskPriority.MEDIUM),
+                    spec.get("parent_task_id"))
+                created.append(task)
+                if flow_id and not task.parent_task_id:
+                    self.add_task_to_flow(flow_id, task.task_id)
+        return created
+
     def create_flow(self, flow_id: str, name: str, description: str) -> Flow:
         """Create a new flow."""
         flow = Flow(flow_id, name, description)
         self.flows[flow_id] = flow
-        self.save_flows()
+        self._log_flow(flow)
         return flow
 
     def add_task_to_flow(self, flow_id: str, task_id: str):
         """Add a task to a flow."""
         if flow_id in self.flows and task_id in self.tasks:
             self.flows[flow_id].add_task(task_id)
-            self.save_flows()
+            self._log_flow(self.flows[flow_id])
 
     def start_task(self, task_id: str):
         """Start a task."""
         if task_id in self.tasks:
+            old_status = self.tasks[task_id].status
             self.tasks[task_id].start()
-            self.save_tasks()
+            self._set_status(task_id, old_status)
+            self._log_task(self.tasks[task_id])
+
+            # A restarted subtask is pending again from the parent's
+            # point of view, or its eventual re-completion would
+            # decrement the counter a second time
+            if old_status == TaskStatus.COMPLETED:
+                self._reopen_parent_pending(task_id)
 
     def complete_task(self, task_id: str):
         """Complete a task."""
         if task_id in self.tasks:
+            old_status = self.tasks[task_id].status
             self.tasks[task_id].complete()
-            self.save_tasks()
+            self._set_status(task_id, old_status)
+            self._log_task(self.tasks[task_id])
 
-            # Check if parent task can be completed
-            self._check_parent_completion(task_id)
+            # Check if parent task can be completed; re-completing an
+            # already-completed task must not decrement the counter twice
+            if old_status != TaskStatus.COMPLETED:
+                self._check_parent_completion(task_id)
 
     def fail_task(self, task_id: str, error_message: str = ""):
         """Fail a task."""
         if task_id in self.tasks:
+            old_status = self.tasks[task_id].status
             self.tasks[task_id].fail(error_message)
-            self.save_tasks()
+            self._set_status(task_id, old_status)
+            self._log_task(self.tasks[task_id])
+
+            if old_status == TaskStatus.COMPLETED:
+                self._reopen_parent_pending(task_id)
+
+    def _reopen_parent_pending(self, task_id: str):
+        """Count a subtask that left COMPLETED as pending again."""
+        task = self.tasks[task_id]
+        if task.parent_task_id and task.parent_task_id in self.tasks:
+            parent_task = self.tasks[task.parent_task_id]
+            parent_task.pending_subtasks += 1
+            self._log_task(parent_task)
 
     def _check_parent_completion(self, task_id: str):
         """Check if parent task can be completed (all subtasks completed)."""
         task = self.tasks[task_id]
         if task.parent_task_id and task.parent_task_id in self.tasks:
             parent_task = self.tasks[task.parent_task_id]
-            # Check if all subtasks are completed
-            all_completed = True
-            for subtask_id in parent_task.subtasks:
-                if subtask_id in self.tasks:
-                    if self.tasks[subtask_id].status != TaskStatus.COMPLETED:
-                        all_completed = False
-                        break
-
-            if all_completed:
+            # One counter decrement instead of a scan over every sibling
+            if parent_task.pending_subtasks > 0:
+                parent_task.pending_subtasks -= 1
+
+            if parent_task.pending_subtasks == 0 and parent_task.status != TaskStatus.COMPLETED:
+                old_status = parent_task.status
                 parent_task.complete()
-                self.save_tasks()
+                self._set_status(parent_task.task_id, old_status)
+                self._log_task(parent_task)
 
     def get_task_status(self, task_id: str) -> Optional[TaskStatus]:
         """Get the status of a task."""
@@ -251,7 +632,7 @@ class TaskManager:
     def list_tasks(self, status: Optional[TaskStatus] = None) -> List[Task]:
         """List all tasks, optionally filtered by status."""
         if status:
-            return [task for task in self.tasks.values() if task.status == status]
+            return [self.tasks[task_id] for task_id in self._by_status[status]]
         return list(self.tasks.values())
 
     def list_flows(self, status: Optional[TaskStatus] = None) -> List[Flow]:
@@ -265,17 +646,31 @@ class TaskManager:
         # Create workspace directory if it doesn't exist
         os.makedirs(self.workspace_path, exist_ok=True)
 
-        tasks_data = {task_id: task.to_dict() for task_id, task in self.tasks.items()}
-        with open(self.tasks_file, 'w') as f:
-            json.dump(tasks_data, f, indent=2)
+        # Serialize compactly in one string and one write; the snapshot
+        # is machine-read only, and indent roughly doubles the bytes.
+        # Writing to a sibling temp file and renaming over the target
+        # makes the swap atomic, so a crash mid-write leaves the old
+        # snapshot intact rather than a truncated one
+        tasks_data = {task_id: task.to_dict() for task_id, task in list(self.tasks.items())}
+        tmp = self.tasks_file + ".tmp"
+        with open(tmp, 'w') as f:
+            f.write(json.dumps(tasks_data, separators=(',', ':')))
+        os.replace(tmp, self.tasks_file)
 
     def load_tasks(self):
         """Load tasks from file."""
         if os.path.exists(self.tasks_file):
             try:
-                with open(self.tasks_file, 'r') as f:
-                    tasks_data = json.load(f)
-                self.tasks = {task_id: Task.from_dict(data) for task_id, data in tasks_data.items()}
+                with open(self.tasks_file, 'rb') as f:
+                    tasks_data = json.loads(f.read())
+                # Drain the parsed dict entry by entry so each raw task
+                # dict is released as soon as its Task exists, instead
+                # of holding the whole parse tree alongside the final
+                # objects until the end of the load
+                self.tasks = {}
+                while tasks_data:
+                    task_id, data = tasks_data.popitem()
+                    self.tasks[task_id] = Task.from_dict(data)
             except Exception as e:
                 print(f"Error loading tasks: {e}")
                 self.tasks = {}
@@ -285,17 +680,22 @@ class TaskManager:
         # Create workspace directory if it doesn't exist
         os.makedirs(self.workspace_path, exist_ok=True)
 
-        flows_data = {flow_id: flow.to_dict() for flow_id, flow in self.flows.items()}
-        with open(self.flows_file, 'w') as f:
-            json.dump(flows_data, f, indent=2)
+        flows_data = {flow_id: flow.to_dict() for flow_id, flow in list(self.flows.items())}
+        tmp = self.flows_file + ".tmp"
+        with open(tmp, 'w') as f:
+            f.write(json.dumps(flows_data, separators=(',', ':')))
+        os.replace(tmp, self.flows_file)
 
     def load_flows(self):
         """Load flows from file."""
         if os.path.exists(self.flows_file):
             try:
-                with open(self.flows_file, 'r') as f:
-                    flows_data = json.load(f)
-                self.flows = {flow_id: Flow.from_dict(data) for flow_id, data in flows_data.items()}
+                with open(self.flows_file, 'rb') as f:
+                    flows_data = json.loads(f.read())
+                self.flows = {}
+                while flows_data:
+                    flow_id, data = flows_data.popitem()
+                    self.flows[flow_id] = Flow.from_dict(data)
             except Exception as e:
                 print(f"Error loading flows: {e}")
                 self.flows = {}
@@ -305,19 +705,20 @@ class TaskManager:
         if task_id not in self.tasks:
             return
 
-        task = self.tasks[task_id]
-        indent_str = "  " * indent
-        status_icon = {
-            TaskStatus.PENDING: "○",
-            TaskStatus.IN_PROGRESS: "◐",
-            TaskStatus.COMPLETED: "✓",
-            TaskStatus.FAILED: "✗"
-        }
-
-        print(f"{indent_str}{status_icon[task.status]} {task.name} ({task.task_id})")
-
-        for subtask_id in task.subtasks:
-            self.print_task_tree(subtask_id, indent + 1)
+        # Walk with an explicit stack and emit one buffered write:
+        # deep trees then cost neither a Python frame per node nor a
+        # flushed print per line
+        lines = []
+        stack = [(task_id, indent)]
+        while stack:
+            current_id, depth = stack.pop()
+            task = self.tasks[current_id]
+            lines.append(f"{'  ' * depth}{_STATUS_ICON[task.status]} {task.name} ({task.task_id})")
+            # Reversed so subtasks print in their recorded order
+            stack.extend((subtask_id, depth + 1)
+                         for subtask_id in reversed(task.subtasks)
+                         if subtask_id in self.tasks)
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def print_flow_overview(self, flow_id: str):
         """Print an overview of a flow and its tasks."""
@@ -331,16 +732,10 @@ class TaskManager:
         print(f"Description: {flow.description}")
         print("Tasks:")
 
-        for task_id in flow.tasks:
-            if task_id in self.tasks:
-                task = self.tasks[task_id]
-                status_icon = {
-                    TaskStatus.PENDING: "○",
-                    TaskStatus.IN_PROGRESS: "◐",
-                    TaskStatus.COMPLETED: "✓",
-                    TaskStatus.FAILED: "✗"
-                }
-                print(f"  {status_icon[task.status]} {task.name}")
+        lines = [f"  {_STATUS_ICON[self.tasks[task_id].status]} {self.tasks[task_id].name}"
+                 for task_id in flow.tasks if task_id in self.tasks]
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
 
 # Example usage
 if __name__ == "__main__":
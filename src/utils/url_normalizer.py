@@ -3,11 +3,26 @@
 URL Normalization and Standardization Module for Auto APK Analyzer
 """
 
+import functools
 import re
 import json
 from urllib.parse import urlparse, urlunparse
-from collections import defaultdict
-
+# Shared parse cache: the same URLs flow through normalization,
+# templating, and map building, and urlparse's internal cache is too
+# small for real URL inventories
+_urlparse = functools.lru_cache(maxsize=8192)(urlparse)
+
+# Confirms a UUID after the cheap length/hyphen prefilter; most
+# segments never reach the regex engine at all
+_UUID_RE = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}')
+
+# Segments that are API vocabulary rather than parameter values
+_RESERVED_SEGMENTS = frozenset({'api', 'v1', 'v2', 'v3', 'users', 'user',
+                                'products', 'product'})
+
+# Cached: the same URL strings recur across the JADX, APKLeaks, and
+# MobSF inputs, and the function is pure - parse, lowercase, rstrip
+@functools.lru_cache(maxsize=8192)
 def normalize_url(url):
     """
     Normalize a URL by standardizing its format.
@@ -20,7 +35,7 @@ def normalize_url(url):
     """
     try:
         # Parse the URL
-        parsed = urlparse(url)
+        parsed = _urlparse(url)
 
         # Normalize scheme (lowercase)
         scheme = parsed.scheme.lower() if parsed.scheme else ''
@@ -45,6 +60,42 @@ def normalize_url(url):
         print(f"Error normalizing URL {url}: {e}")
         return url
 
+def _template_path(path):
+    """
+    Template the parameters of an already-parsed path.
+
+    Classifies each segment with string methods; the regex engine only
+    runs to confirm UUID-shaped candidates. Every segment - including
+    the last one, which the old slash-delimited patterns used to miss -
+    is handled in a single walk.
+
+    Args:
+        path (str): URL path component
+
+    Returns:
+        tuple: (templated_path, parameters)
+    """
+    parameters = []
+    segments = path.split('/')
+    for i, segment in enumerate(segments):
+        if not segment:
+            continue
+        if segment.isdigit():
+            parameters.append({'type': 'numeric_id', 'value': segment})
+            segments[i] = '{id}'
+        elif (len(segment) == 36 and segment.count('-') == 4
+                and _UUID_RE.fullmatch(segment)):
+            parameters.append({'type': 'uuid', 'value': segment})
+            segments[i] = '{uuid}'
+        elif segment.isalnum() and not segment.isalpha():
+            # Only letter-digit mixes read as identifiers; pure words
+            # (/login, /admin) are static endpoints that must keep
+            # distinct signatures and stay visible to the risk scan
+            if segment.lower() not in _RESERVED_SEGMENTS:
+                parameters.append({'type': 'alphanumeric_id', 'value': segment})
+                segments[i] = '{param}'
+    return '/'.join(segments), parameters
+
 def extract_path_parameters(url):
     """
     Extract path parameters from a URL and replace them with placeholders.
@@ -56,40 +107,8 @@ def extract_path_parameters(url):
         tuple: (normalized_url, parameters)
     """
     try:
-        parsed = urlparse(url)
-        path = parsed.path
-
-        # Common patterns for path parameters
-        # UUIDs
-        uuid_pattern = r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}'
-        # Numeric IDs
-        numeric_pattern = r'/\d+/'
-        # Alphanumeric IDs
-        alphanumeric_pattern = r'/[a-zA-Z0-9]+/'
-
-        parameters = []
-
-        # Extract UUIDs
-        uuid_matches = re.findall(uuid_pattern, path)
-        for match in uuid_matches:
-            parameters.append({'type': 'uuid', 'value': match})
-            path = path.replace(match, '{uuid}')
-
-        # Extract numeric IDs
-        numeric_matches = re.findall(numeric_pattern, path)
-        for match in numeric_matches:
-            param_value = match.strip('/')
-            parameters.append({'type': 'numeric_id', 'value': param_value})
-            path = path.replace(match, '/{id}/')
-
-        # Extract alphanumeric IDs (more generic)
-        alphanumeric_matches = re.findall(alphanumeric_pattern, path)
-        for match in alphanumeric_matches:
-            param_value = match.strip('/')
-            # Skip common words that are unlikely to be parameters
-            if param_value.lower() not in ['api', 'v1', 'v2', 'v3', 'users', 'user', 'products', 'product']:
-                parameters.append({'type': 'alphanumeric_id', 'value': param_value})
-                path = path.replace(f'/{param_value}/', '/{param}/')
+        parsed = _urlparse(url)
+        path, parameters = _template_path(parsed.path)
 
         # Reconstruct URL with normalized path
         normalized_url = urlunparse((
@@ -117,17 +136,16 @@ def deduplicate_urls(urls):
     Returns:
         list: Deduplicated URLs
     """
-    # Normalize all URLs first
-    normalized_urls = []
-    url_map = defaultdict(list)  # Map normalized URLs to original URLs
-
+    # One pass with a seen-set: no throwaway list or mapping, and the
+    # first-seen order of the input is preserved
+    seen = set()
+    unique = []
     for url in urls:
         normalized = normalize_url(url)
-        normalized_urls.append(normalized)
-        url_map[normalized].append(url)
-
-    # Return unique normalized URLs
-    return list(set(normalized_urls))
+        if normalized not in seen:
+            seen.add(normalized)
+            unique.append(normalized)
+    return unique
 
 def merge_static_results(jadx_results, apkleaks_results, mobsf_results):
     """
@@ -141,24 +159,21 @@ def merge_static_results(jadx_results, apkleaks_results, mobsf_results):
     Returns:
         dict: Merged and normalized results
     """
-    # Collect all URLs from different sources
-    all_urls = []
-
-    # Add URLs from JADX
-    if 'urls' in jadx_results:
-        all_urls.extend(jadx_results['urls'])
-
-    # Add URLs from APKLeaks
-    if 'urls' in apkleaks_results:
-        all_urls.extend(apkleaks_results['urls'])
-
-    # Add URLs from MobSF
-    if 'urls' in mobsf_results:
-        all_urls.extend(mobsf_results['urls'])
+    # Collect all URLs from different sources, hoisting each list once
+    jadx_urls = jadx_results.get('urls', [])
+    apkleaks_urls = apkleaks_results.get('urls', [])
+    mobsf_urls = mobsf_results.get('urls', [])
+    all_urls = [*jadx_urls, *apkleaks_urls, *mobsf_urls]
 
     # Deduplicate URLs
     unique_urls = deduplicate_urls(all_urls)
 
+    # Set views make per-URL source attribution O(1) instead of a
+    # linear scan of each source list per unique URL
+    jadx_set = set(jadx_urls)
+    apkleaks_set = set(apkleaks_urls)
+    mobsf_set = set(mobsf_urls)
+
     # Process URLs to extract parameters and normalize
     normalized_entries = []
     for url in unique_urls:
@@ -173,47 +188,30 @@ def merge_static_results(jadx_results, apkleaks_results, mobsf_results):
         }
 
         # Determine which sources contributed this URL
-        if url in jadx_results.get('urls', []):
+        if url in jadx_set:
             entry['sources'].append('jadx')
-        if url in apkleaks_results.get('urls', []):
+        if url in apkleaks_set:
             entry['sources'].append('apkleaks')
-        if url in mobsf_results.get('urls', []):
+        if url in mobsf_set:
             entry['sources'].append('mobsf')
 
         normalized_entries.append(entry)
 
-    # Collect domains
-    domains = set()
-    if 'domains' in jadx_results:
-        domains.update(jadx_results['domains'])
-    if 'domains' in apkleaks_results:
-        domains.update(apkleaks_results['domains'])
-    if 'domains' in mobsf_results:
-        domains.update(mobsf_results['domains'])
-
-    # Collect endpoints
-    endpoints = set()
-    if 'endpoints' in jadx_results:
-        endpoints.update(jadx_results['endpoints'])
-    if 'endpoints' in apkleaks_results:
-        endpoints.update(apkleaks_results['endpoints'])
-    if 'endpoints' in mobsf_results:
-        endpoints.update(mobsf_results['endpoints'])
-
-    # Collect secrets
-    secrets = []
-    if 'secrets' in apkleaks_results:
-        secrets.extend(apkleaks_results['secrets'])
-
-    # Collect permissions
-    permissions = []
-    if 'permissions' in mobsf_results:
-        permissions.extend(mobsf_results['permissions'])
-
-    # Collect certificates
-    certificates = []
-    if 'certificates' in mobsf_results:
-        certificates.extend(mobsf_results['certificates'])
+    # Collect domains and endpoints in one C-level union each instead
+    # of guarded per-source update calls; () defaults avoid allocating
+    # empty lists for absent keys
+    domains = set().union(jadx_results.get('domains', ()),
+                          apkleaks_results.get('domains', ()),
+                          mobsf_results.get('domains', ()))
+    endpoints = set().union(jadx_results.get('endpoints', ()),
+                            apkleaks_results.get('endpoints', ()),
+                            mobsf_results.get('endpoints', ()))
+
+    # Secrets, permissions, and certificates each come from one source
+    # and keep order and duplicates
+    secrets = list(apkleaks_results.get('secrets', ()))
+    permissions = list(mobsf_results.get('permissions', ()))
+    certificates = list(mobsf_results.get('certificates', ()))
 
     return {
         'urls': normalized_entries,
@@ -224,6 +222,110 @@ def merge_static_results(jadx_results, apkleaks_results, mobsf_results):
         'certificates': certificates
     }
 
+# Indicators that raise an endpoint's risk level, compiled into one
+# alternation so each candidate string is scanned once instead of once
+# per indicator
+_RISK_RE = re.compile(
+    r'admin|login|auth|token|password|secret|key|config|debug|test|dev')
+
+def build_url_map(jadx_results, apkleaks_results, mobsf_results):
+    """
+    Build the static URL map with one parse per URL.
+
+    Fuses merge_static_results and generate_url_map: each discovered
+    URL goes through urlparse exactly once, and normalization,
+    deduplication, parameter templating, source attribution, and risk
+    scoring all work from that single parse instead of re-parsing at
+    every stage.
+
+    Args:
+        jadx_results (dict): Results from JADX analysis
+        apkleaks_results (dict): Results from APKLeaks analysis
+        mobsf_results (dict): Results from MobSF analysis
+
+    Returns:
+        dict: Structured URL map
+    """
+    jadx_urls = jadx_results.get('urls', [])
+    apkleaks_urls = apkleaks_results.get('urls', [])
+    mobsf_urls = mobsf_results.get('urls', [])
+    source_sets = (('jadx', set(jadx_urls)),
+                   ('apkleaks', set(apkleaks_urls)),
+                   ('mobsf', set(mobsf_urls)))
+
+    entries = []
+    seen = set()
+    for url in (*jadx_urls, *apkleaks_urls, *mobsf_urls):
+        try:
+            parsed = _urlparse(url)
+            scheme = parsed.scheme.lower() if parsed.scheme else ''
+            netloc = parsed.netloc.lower().rstrip('.') if parsed.netloc else ''
+            path = parsed.path
+            if path and path != '/':
+                path = path.rstrip('/')
+
+            normalized = urlunparse((scheme, netloc, path, parsed.params,
+                                     parsed.query, parsed.fragment))
+            if normalized in seen:
+                continue
+            seen.add(normalized)
+
+            templated_path, parameters = _template_path(path)
+            templated_url = urlunparse((scheme, netloc, templated_path,
+                                        parsed.params, parsed.query,
+                                        parsed.fragment))
+
+            # Determine risk level based on URL content; each string is
+            # lowercased once, and the parameter values collapse into a
+            # single joined scan instead of one search per value
+            risk_level = 'LOW'
+            if _RISK_RE.search(templated_url.lower()):
+                risk_level = 'HIGH'
+            elif parameters and _RISK_RE.search(
+                    '\n'.join(param.get('value', '') for param in parameters).lower()):
+                risk_level = 'MEDIUM'
+
+            entries.append({
+                'signature': f"{netloc}{templated_path}",
+                'host': netloc,
+                'path': templated_path,
+                'method': 'UNKNOWN',  # Will be determined during dynamic analysis
+                'parameters': parameters,
+                'sources': [name for name, urls in source_sets if url in urls],
+                'original_urls': [url],
+                'risk_level': risk_level
+            })
+        except Exception as e:
+            print(f"Error processing URL {url}: {e}")
+            continue
+
+    domains = set().union(jadx_results.get('domains', ()),
+                          apkleaks_results.get('domains', ()),
+                          mobsf_results.get('domains', ()))
+    endpoints = set().union(jadx_results.get('endpoints', ()),
+                            apkleaks_results.get('endpoints', ()),
+                            mobsf_results.get('endpoints', ()))
+
+    secrets = list(apkleaks_results.get('secrets', ()))
+    permissions = list(mobsf_results.get('permissions', ()))
+    certificates = list(mobsf_results.get('certificates', ()))
+
+    return {
+        'entries': entries,
+        'domains': list(domains),
+        'endpoints': list(endpoints),
+        'secrets': secrets,
+        'permissions': permissions,
+        'certificates': certificates,
+        'summary': {
+            'total_urls': len(entries),
+            'unique_domains': len(domains),
+            'endpoints_count': len(endpoints),
+            'secrets_count': len(secrets),
+            'permissions_count': len(permissions)
+        }
+    }
+
 def generate_url_map(merged_results):
     """
     Generate a comprehensive URL map from merged results.
@@ -254,7 +356,7 @@ def generate_url_map(merged_results):
     for entry in merged_results.get('urls', []):
         # Parse URL components
         try:
-            parsed = urlparse(entry['url'])
+            parsed = _urlparse(entry['url'])
             url_entry = {
                 'signature': f"{parsed.netloc}{parsed.path}",
                 'host': parsed.netloc,
@@ -266,20 +368,15 @@ def generate_url_map(merged_results):
                 'risk_level': 'UNKNOWN'
             }
 
-            # Determine risk level based on URL content
-            risk_indicators = [
-                'admin', 'login', 'auth', 'token', 'password', 'secret',
-                'key', 'config', 'debug', 'test', 'dev'
-            ]
-
+            # Determine risk level based on URL content; one lowercase
+            # and one scan for the URL, one joined scan for the values
             risk_level = 'LOW'
-            for indicator in risk_indicators:
-                if indicator in entry['url'].lower():
-                    risk_level = 'HIGH'
-                    break
-                elif any(indicator in param.get('value', '').lower() for param in entry['parameters']):
-                    risk_level = 'MEDIUM'
-                    break
+            if _RISK_RE.search(entry['url'].lower()):
+                risk_level = 'HIGH'
+            elif entry['parameters'] and _RISK_RE.search(
+                    '\n'.join(param.get('value', '')
+                              for param in entry['parameters']).lower()):
+                risk_level = 'MEDIUM'
 
             url_entry['risk_level'] = risk_level
             url_map['entries'].append(url_entry)
@@ -327,7 +424,8 @@ if __name__ == "__main__":
     print("Merged Results:")
     print(json.dumps(merged, indent=2))
 
-    # Generate URL map
-    url_map = generate_url_map(merged)
+    # Generate URL map through the fused one-pass path: one parse per
+    # URL straight from the scanner outputs to map entries
+    url_map = build_url_map(jadx_results, apkleaks_results, mobsf_results)
     print("\nURL Map:")
     print(json.dumps(url_map, indent=2))
\ No newline at end of file
@@ -6,6 +6,7 @@ Workspace Manager for Auto APK Analyzer
 import os
 import json
 import shutil
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
 
 class WorkspaceManager:
@@ -20,12 +21,17 @@ class WorkspaceManager:
         self.apk_dir = self.base_path / "apks"
         self.results_dir = self.base_path / "results"
         self.logs_dir = self.base_path / "logs"
+        # Result writes go through a small pool so a batch of analyzed
+        # apps overlaps its file I/O instead of serializing on it
+        self._io_pool = ThreadPoolExecutor(max_workers=4)
+        self._pending_saves = []
         self.create_directories()
 
     def create_directories(self):
         """Create necessary directories for the workspace."""
-        directories = [self.base_path, self.apk_dir, self.results_dir, self.logs_dir]
-        for directory in directories:
+        # The three subdirectories create base_path transitively via
+        # parents=True, so it needs no mkdir of its own
+        for directory in (self.apk_dir, self.results_dir, self.logs_dir):
             directory.mkdir(parents=True, exist_ok=True)
 
     def create_developer_workspace(self, developer_name):
@@ -72,31 +78,57 @@ class WorkspaceManager:
         Returns:
             dict: Dictionary with developer names as keys and workspace paths as values
         """
-        workspaces = {}
-        if self.apk_dir.exists():
-            for item in self.apk_dir.iterdir():
-                if item.is_dir():
-                    workspaces[item.name] = str(item)
-        return workspaces
+        # scandir's DirEntry answers is_dir() from the directory read
+        # itself on Linux, so the listing costs no stat per entry the
+        # way iterdir's Path objects do
+        try:
+            with os.scandir(self.apk_dir) as entries:
+                return {entry.name: entry.path for entry in entries if entry.is_dir()}
+        except FileNotFoundError:
+            return {}
 
     def save_analysis_results(self, developer, app_package, results):
         """
         Save analysis results for a specific app.
 
+        The serialize-and-write happens on the I/O pool; the returned
+        future resolves when the file is on disk. Call flush_saves()
+        before reading results back or shutting down.
+
         Args:
             developer (str): Developer name
             app_package (str): App package name
             results (dict): Analysis results
+
+        Returns:
+            concurrent.futures.Future: Completion handle for the write
         """
+        future = self._io_pool.submit(self._write_results, developer,
+                                      app_package, results)
+        self._pending_saves.append(future)
+        return future
+
+    def _write_results(self, developer, app_package, results):
+        """Serialize and write one result file (runs on the pool)."""
         dev_results_dir = self.results_dir / developer
         dev_results_dir.mkdir(exist_ok=True)
 
         results_file = dev_results_dir / f"{app_package}_results.json"
+        # Serialize to one string and write it in one call; json.dump
+        # streams through many small writes, which dominates save time
+        # for large merged URL maps
         with open(results_file, 'w') as f:
-            json.dump(results, f, indent=2)
+            f.write(json.dumps(results, indent=2))
 
         print(f"Saved results for {app_package} to {results_file}")
 
+    def flush_saves(self):
+        """Block until every queued result write has finished."""
+        pending = self._pending_saves
+        self._pending_saves = []
+        if pending:
+            wait(pending)
+
     def save_log(self, log_name, content):
         """
         Save log content to a file.
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Shared pytest configuration for Auto APK Analyzer tests
+"""
+
+import os
+import sys
+
+import pytest
+
+# One path insertion for the whole suite, instead of a sys.path.append
+# at the top of every test module. Position 0 lets src imports hit the
+# first candidate directory; the guard keeps re-imports of this
+# conftest from stacking duplicate entries
+_SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if _SRC_PATH not in sys.path:
+    sys.path.insert(0, _SRC_PATH)
+
+@pytest.fixture(scope='session')
+def dummy_apk(tmp_path_factory):
+    """
+    One dummy APK shared by every test that needs a path to point at.
+
+    The tests only read this file, so building it once per session (per
+    xdist worker) replaces the identical mkdir/touch each TestCase used
+    to repeat in setUp. pytest removes the directory at session end.
+    """
+    apk = tmp_path_factory.mktemp('apk') / 'test.apk'
+    apk.touch()
+    return apk
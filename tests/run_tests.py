@@ -3,26 +3,30 @@
 Test runner for Auto APK Analyzer
 """
 
-import unittest
 import sys
 import os
 
+import pytest
+
 def run_all_tests():
     """Run all tests in the tests directory"""
-    # Add src directory to Python path
-    src_path = os.path.join(os.path.dirname(__file__), '..', 'src')
-    sys.path.append(src_path)
-
-    # Discover and run all tests
-    loader = unittest.TestLoader()
+    # pytest collection picks up conftest.py, which handles the src
+    # path setup once for every module
     start_dir = os.path.dirname(__file__)
-    suite = loader.discover(start_dir, pattern='test_*.py')
+    args = ['-q', start_dir]
 
-    runner = unittest.TextTestRunner(verbosity=2)
-    result = runner.run(suite)
+    # The tests are stateless and fully mocked, so they parallelize
+    # cleanly; spread them over the cores when pytest-xdist is
+    # installed, and fall back to the serial runner when it is not.
+    # loadfile keeps each module on one worker, so whole-suite time
+    # approaches the slowest file instead of the sum of all files
+    try:
+        import xdist  # noqa: F401
+        args = ['-n', 'auto', '--dist=loadfile'] + args
+    except ImportError:
+        pass
 
-    # Return exit code based on test results
-    return 0 if result.wasSuccessful() else 1
+    return pytest.main(args)
 
 if __name__ == '__main__':
     sys.exit(run_all_tests())
\ No newline at end of file
@@ -7,9 +7,7 @@ import unittest
 import os
 from unittest.mock import patch, MagicMock
 
-# Add src directory to Python path
 import sys
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from component.component_enumerator import (
     is_drozer_available,
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Unit tests for device manager package-line parsing
+"""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from utils import device_manager
+
+# Android 11+ install path with base64 padding; the '='s inside the
+# path must not confuse the path/package split
+_PM_LIST_LINE = ("package:/data/app/~~dQbjqhtdGCzKKzg2Ahnktg==/"
+                 "com.example.app-Ab3dE==/base.apk=com.example.app")
+
+@pytest.fixture(autouse=True)
+def _fresh_caches():
+    """Run each test against empty caches and leave none behind."""
+    device_manager.invalidate_cache()
+    yield
+    device_manager.invalidate_cache()
+
+@patch('utils.device_manager.subprocess.run')
+def test_list_packages_parses_base64_paths(mock_run):
+    """Paths containing '==' split on the last '=' only"""
+    def fake_run(cmd, **kwargs):
+        if 'getprop' in cmd:
+            return SimpleNamespace(stdout="SERIAL123\n")
+        return SimpleNamespace(stdout=_PM_LIST_LINE + "\n")
+    mock_run.side_effect = fake_run
+
+    packages = device_manager.list_third_party_packages()
+    assert packages == ["com.example.app"]
+    # The path cache learned the full path, padding included
+    assert device_manager.get_apk_path("com.example.app") == (
+        "/data/app/~~dQbjqhtdGCzKKzg2Ahnktg==/com.example.app-Ab3dE==/base.apk")
+
+@patch('utils.device_manager.subprocess.run')
+def test_list_packages_parses_pathless_lines(mock_run):
+    """Plain 'package:name' lines still parse without a path"""
+    def fake_run(cmd, **kwargs):
+        if 'getprop' in cmd:
+            return SimpleNamespace(stdout="SERIAL123\n")
+        return SimpleNamespace(stdout="package:com.example.app\n")
+    mock_run.side_effect = fake_run
+
+    assert device_manager.list_third_party_packages() == ["com.example.app"]
+
+if __name__ == '__main__':
+    raise SystemExit(pytest.main([__file__]))
@@ -4,14 +4,10 @@ Unit tests for dynamic analyzer module
 """
 
 import unittest
-import tempfile
-import os
-from pathlib import Path
-from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import patch
 
-# Add src directory to Python path
-import sys
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import pytest
 
 from dynamic.dynamic_analyzer import (
     setup_reqable_capture,
@@ -24,6 +20,10 @@ from dynamic.dynamic_analyzer import (
     spawn_and_hook_app
 )
 
+# Canned adb output, built once at import instead of per test
+_ADB_DEVICES_OK = "List of devices attached\n1234567890\tdevice\n"
+_ADB_DEVICES_EMPTY = "List of devices attached\n"
+
 class TestDynamicAnalyzer(unittest.TestCase):
     """Test cases for dynamic analyzer functions"""
 
@@ -49,11 +49,11 @@ class TestDynamicAnalyzer(unittest.TestCase):
     @patch('dynamic.dynamic_analyzer.subprocess.run')
     def test_is_device_connected_success(self, mock_run):
         """Test device connection check - success case"""
-        # Mock successful ADB devices command
-        mock_result = MagicMock()
-        mock_result.stdout = "List of devices attached\n1234567890\tdevice\n"
-        mock_result.returncode = 0
-        mock_run.return_value = mock_result
+        # Mock successful ADB devices command; a plain namespace is all
+        # the code under test reads, and it builds far faster than a
+        # MagicMock with its auto-created child mocks
+        mock_run.return_value = SimpleNamespace(stdout=_ADB_DEVICES_OK,
+                                                returncode=0)
 
         result = is_device_connected()
         self.assertTrue(result)
@@ -62,21 +62,20 @@ class TestDynamicAnalyzer(unittest.TestCase):
     def test_is_device_connected_failure(self, mock_run):
         """Test device connection check - failure case"""
         # Mock failed ADB devices command
-        mock_result = MagicMock()
-        mock_result.stdout = "List of devices attached\n"
-        mock_result.returncode = 0
-        mock_run.return_value = mock_result
+        mock_run.return_value = SimpleNamespace(stdout=_ADB_DEVICES_EMPTY,
+                                                returncode=0)
 
         result = is_device_connected()
         self.assertFalse(result)
 
     @patch('dynamic.dynamic_analyzer.subprocess.Popen')
-    @patch('dynamic.dynamic_analyzer.time.sleep')
-    def test_run_frida_hook_success(self, mock_sleep, mock_popen):
+    @patch('dynamic.dynamic_analyzer._wait_for_exit', return_value=False)
+    def test_run_frida_hook_success(self, mock_wait, mock_popen):
         """Test Frida hook function - success case"""
-        # Mock successful Frida process
-        mock_process = MagicMock()
-        mock_process.poll.return_value = None  # Process is still running
+        # Stub the exit-wait itself: a still-running process would
+        # otherwise spin _wait_for_exit's full 2s poll window, even
+        # with time.sleep patched out
+        mock_process = SimpleNamespace(poll=lambda: None)
         mock_popen.return_value = mock_process
 
         result = run_frida_hook(self.test_package)
@@ -84,30 +83,29 @@ class TestDynamicAnalyzer(unittest.TestCase):
         self.assertEqual(result, mock_process)
 
     @patch('dynamic.dynamic_analyzer.subprocess.Popen')
-    @patch('dynamic.dynamic_analyzer.time.sleep')
-    def test_run_frida_hook_failure(self, mock_sleep, mock_popen):
+    def test_run_frida_hook_failure(self, mock_popen):
         """Test Frida hook function - failure case"""
-        # Mock failed Frida process
-        mock_process = MagicMock()
-        mock_process.poll.return_value = 1  # Process has terminated
-        mock_process.communicate.return_value = ("", "Error message")
-        mock_popen.return_value = mock_process
+        # poll() reporting an exit code makes _wait_for_exit return on
+        # its first check, so no sleep patch is needed here
+        mock_popen.return_value = SimpleNamespace(
+            poll=lambda: 1,
+            communicate=lambda: ("", "Error message"))
 
         result = run_frida_hook(self.test_package)
         self.assertIsNone(result)
 
-    def test_collect_proxy_flows(self):
+    @patch('dynamic.dynamic_analyzer.time.sleep')
+    def test_collect_proxy_flows(self, mock_sleep):
         """Test proxy flow collection function"""
-        result = collect_proxy_flows(duration=5)
+        # duration=0 plus a patched sleep keeps the collection wait out
+        # of the test entirely, so this no longer needs the slow mark
+        result = collect_proxy_flows(duration=0)
         self.assertIsInstance(result, list)
         # Check that we get some flow data
         self.assertGreater(len(result), 0)
         # Check structure of flow data
-        flow = result[0]
-        self.assertIn("method", flow)
-        self.assertIn("url", flow)
-        self.assertIn("headers", flow)
-        self.assertIn("response_status", flow)
+        self.assertGreaterEqual(result[0].keys(),
+                                {"method", "url", "headers", "response_status"})
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -4,14 +4,10 @@ Unit tests for Flutter handler module
 """
 
 import unittest
-import tempfile
-import os
-from pathlib import Path
-from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import patch
 
-# Add src directory to Python path
-import sys
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import pytest
 
 from flutter.flutter_handler import (
     is_flutter_app,
@@ -25,22 +21,12 @@ from flutter.flutter_handler import (
 class TestFlutterHandler(unittest.TestCase):
     """Test cases for Flutter handler functions"""
 
-    def setUp(self):
-        """Set up test fixtures before each test method."""
-        # Create a temporary directory for test files
-        self.test_dir = Path(tempfile.mkdtemp())
-        self.test_apk = self.test_dir / "test.apk"
-        # Create a dummy APK file for testing
-        self.test_apk.touch()
+    @pytest.fixture(autouse=True)
+    def _attach_fixtures(self, dummy_apk):
+        """Bind the session-scoped dummy APK to the test instance."""
+        self.test_apk = dummy_apk
         self.test_package = "com.example.flutterapp"
 
-    def tearDown(self):
-        """Tear down test fixtures after each test method."""
-        # Clean up temporary files
-        if self.test_apk.exists():
-            self.test_apk.unlink()
-        self.test_dir.rmdir()
-
     def test_is_flutter_app_false(self):
         """Test Flutter app detection - false case"""
         # For this test, we'll just check that the function runs without error
@@ -61,9 +47,9 @@ class TestFlutterHandler(unittest.TestCase):
     @patch('flutter.flutter_handler.subprocess.run')
     def test_setup_proxy_routing(self, mock_run):
         """Test proxy routing setup function"""
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_run.return_value = mock_result
+        # The code only reads returncode, so a plain namespace beats
+        # paying for a full MagicMock
+        mock_run.return_value = SimpleNamespace(returncode=0)
 
         result = setup_proxy_routing("192.168.1.100", 8080)
         self.assertTrue(result)
@@ -71,9 +57,7 @@ class TestFlutterHandler(unittest.TestCase):
     @patch('flutter.flutter_handler.subprocess.run')
     def test_disable_proxy_routing(self, mock_run):
         """Test proxy routing disable function"""
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_run.return_value = mock_result
+        mock_run.return_value = SimpleNamespace(returncode=0)
 
         result = disable_proxy_routing()
         self.assertTrue(result)
@@ -90,9 +74,8 @@ class TestFlutterHandler(unittest.TestCase):
 
         result = handle_flutter_app(self.test_package, str(self.test_apk), mode='frida')
         self.assertIsInstance(result, dict)
-        self.assertIn("package", result)
-        self.assertIn("is_flutter", result)
-        self.assertIn("mode", result)
+        self.assertGreaterEqual(result.keys(),
+                                {"package", "is_flutter", "mode"})
         self.assertTrue(result["is_flutter"])
 
 if __name__ == '__main__':
@@ -3,15 +3,10 @@
 Unit tests for URL mapper module
 """
 
+import io
 import unittest
-import tempfile
-import os
-import json
-from pathlib import Path
 
-# Add src directory to Python path
-import sys
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import pytest
 
 from mapping.url_mapper import (
     create_url_mapping_entry,
@@ -22,21 +17,54 @@ from mapping.url_mapper import (
     compare_url_maps
 )
 
+# Shared sample inputs, built once instead of re-allocated inside each
+# test. The functions under test treat their inputs as read-only; the
+# merge/generate tests pass these directly.
+STATIC_SAMPLE = {
+    "urls": [
+        {
+            "url": "https://api.example.com/v1/users/123",
+            "original_url": "https://api.example.com/v1/users/123",
+            "parameters": [{"type": "numeric_id", "value": "123"}],
+            "sources": ["jadx"]
+        }
+    ],
+    "domains": ["api.example.com"],
+    "endpoints": ["/api/v1/login"]
+}
+
+DYNAMIC_SAMPLE = [
+    {
+        "method": "GET",
+        "url": "https://api.example.com/v1/users/456",
+        "headers": {"Authorization": "Bearer token"},
+        "response_status": 200
+    }
+]
+
+URL_MAP_SAMPLE = {
+    "entries": [
+        {
+            "signature": "api.example.com/v1/users/{id}",
+            "host": "api.example.com",
+            "path": "/v1/users/{id}",
+            "method": "GET",
+            "parameters": [{"type": "numeric_id", "value": "123"}],
+            "sources": ["static"],
+            "original_urls": ["https://api.example.com/v1/users/123"],
+            "risk_level": "LOW"
+        }
+    ],
+    "domains": ["api.example.com"]
+}
+
 class TestUrlMapper(unittest.TestCase):
     """Test cases for URL mapper functions"""
 
-    def setUp(self):
-        """Set up test fixtures before each test method."""
-        # Create a temporary directory for test files
-        self.test_dir = Path(tempfile.mkdtemp())
-        self.test_file = self.test_dir / "test_map.json"
-
-    def tearDown(self):
-        """Tear down test fixtures after each test method."""
-        # Clean up temporary files
-        if self.test_file.exists():
-            self.test_file.unlink()
-        self.test_dir.rmdir()
+    @pytest.fixture(autouse=True)
+    def _attach_fixtures(self, tmp_path):
+        """Give each test a scratch path for the map round-trip tests."""
+        self.test_file = tmp_path / "test_map.json"
 
     def test_create_url_mapping_entry(self):
         """Test URL mapping entry creation"""
@@ -44,106 +72,52 @@ class TestUrlMapper(unittest.TestCase):
         entry = create_url_mapping_entry(url, method="GET", source="static")
 
         self.assertIsInstance(entry, dict)
-        self.assertIn("signature", entry)
-        self.assertIn("host", entry)
-        self.assertIn("path", entry)
-        self.assertIn("method", entry)
-        self.assertIn("parameters", entry)
-        self.assertIn("sources", entry)
-        self.assertIn("original_urls", entry)
-        self.assertIn("risk_level", entry)
+        # One subset check instead of eight assertIn round trips, and
+        # one failure message listing everything missing
+        self.assertGreaterEqual(entry.keys(), {
+            "signature", "host", "path", "method", "parameters",
+            "sources", "original_urls", "risk_level"})
         self.assertEqual(entry["method"], "GET")
         self.assertIn("static", entry["sources"])
         self.assertIn(url, entry["original_urls"])
 
     def test_merge_static_dynamic_data(self):
         """Test merging of static and dynamic data"""
-        static_results = {
-            "urls": [
-                {
-                    "url": "https://api.example.com/v1/users/123",
-                    "original_url": "https://api.example.com/v1/users/123",
-                    "parameters": [{"type": "numeric_id", "value": "123"}],
-                    "sources": ["jadx"]
-                }
-            ],
-            "domains": ["api.example.com"],
-            "endpoints": ["/api/v1/login"]
-        }
-
-        dynamic_results = [
-            {
-                "method": "GET",
-                "url": "https://api.example.com/v1/users/456",
-                "headers": {"Authorization": "Bearer token"},
-                "response_status": 200
-            }
-        ]
-
-        merged = merge_static_dynamic_data(static_results, dynamic_results)
+        merged = merge_static_dynamic_data(STATIC_SAMPLE, DYNAMIC_SAMPLE)
         self.assertIsInstance(merged, dict)
-        self.assertIn("entries", merged)
-        self.assertIn("domains", merged)
-        self.assertIn("endpoints", merged)
+        self.assertGreaterEqual(merged.keys(),
+                                {"entries", "domains", "endpoints"})
 
     def test_generate_url_map(self):
         """Test URL map generation"""
-        static_results = {
-            "urls": [
-                {
-                    "url": "https://api.example.com/v1/users/123",
-                    "original_url": "https://api.example.com/v1/users/123",
-                    "parameters": [{"type": "numeric_id", "value": "123"}],
-                    "sources": ["jadx"]
-                }
-            ],
-            "domains": ["api.example.com"],
-            "endpoints": ["/api/v1/login"]
-        }
-
-        dynamic_results = [
-            {
-                "method": "GET",
-                "url": "https://api.example.com/v1/users/456",
-                "headers": {"Authorization": "Bearer token"},
-                "response_status": 200
-            }
-        ]
-
-        url_map = generate_url_map(static_results, dynamic_results)
+        url_map = generate_url_map(STATIC_SAMPLE, DYNAMIC_SAMPLE)
         self.assertIsInstance(url_map, dict)
-        self.assertIn("metadata", url_map)
-        self.assertIn("entries", url_map)
-        self.assertIn("domains", url_map)
+        self.assertGreaterEqual(url_map.keys(),
+                                {"metadata", "entries", "domains"})
+
+    def test_save_and_load_url_map_in_memory(self):
+        """Test JSON round-tripping through a file-like object"""
+        # The round-trip itself needs no disk at all; StringIO keeps
+        # this a pure in-memory test
+        buf = io.StringIO()
+        result = save_url_map(URL_MAP_SAMPLE, buf)
+        self.assertTrue(result)
 
-    def test_save_and_load_url_map(self):
-        """Test saving and loading URL maps"""
-        url_map = {
-            "entries": [
-                {
-                    "signature": "api.example.com/v1/users/{id}",
-                    "host": "api.example.com",
-                    "path": "/v1/users/{id}",
-                    "method": "GET",
-                    "parameters": [{"type": "numeric_id", "value": "123"}],
-                    "sources": ["static"],
-                    "original_urls": ["https://api.example.com/v1/users/123"],
-                    "risk_level": "LOW"
-                }
-            ],
-            "domains": ["api.example.com"]
-        }
+        buf.seek(0)
+        loaded_map = load_url_map(buf)
+        self.assertEqual(loaded_map, URL_MAP_SAMPLE)
 
-        # Test saving
-        result = save_url_map(url_map, str(self.test_file))
+    def test_save_and_load_url_map(self):
+        """Test saving and loading URL maps through a real path"""
+        # Kept on disk as the path-handling sanity check
+        result = save_url_map(URL_MAP_SAMPLE, str(self.test_file))
         self.assertTrue(result)
         self.assertTrue(self.test_file.exists())
 
         # Test loading
         loaded_map = load_url_map(str(self.test_file))
         self.assertIsInstance(loaded_map, dict)
-        self.assertIn("entries", loaded_map)
-        self.assertIn("domains", loaded_map)
+        self.assertGreaterEqual(loaded_map.keys(), {"entries", "domains"})
 
     def test_compare_url_maps(self):
         """Test URL map comparison"""
@@ -183,9 +157,8 @@ class TestUrlMapper(unittest.TestCase):
 
         comparison = compare_url_maps(old_map, new_map)
         self.assertIsInstance(comparison, dict)
-        self.assertIn("added", comparison)
-        self.assertIn("removed", comparison)
-        self.assertIn("unchanged", comparison)
+        self.assertGreaterEqual(comparison.keys(),
+                                {"added", "removed", "unchanged"})
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file